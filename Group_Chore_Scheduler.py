@@ -1,10 +1,42 @@
 import random
 import math
-from flask import Flask, request, jsonify
 from typing import List, Dict
 import copy
+import hashlib
+import io
+import os
+from collections import OrderedDict
 import numpy as np
 
+#weights
+W_FAIRNESS = 100.0
+W_LOVE = 5.0
+W_HATE = -5.0
+#scales negative difficulty sums before they are squared, a smaller value penalizes hard chores more
+W_DIFFICULTY = 3.0
+#the public difficulty weight multiplies each user's difficulty score (bonus or penalty), 1.0 is the original scoring
+DEFAULT_WEIGHTS = {'fairness': W_FAIRNESS, 'love': W_LOVE, 'hate': W_HATE, 'difficulty': 1.0}
+
+#instances whose count-matrix search space is at most this many leaves are solved exactly
+EXACT_SEARCH_LIMIT = 2000
+#search nodes "auto" lets branch and bound visit before it hands over to annealing,
+#about a third of what 500 annealing iterations cost, so a search that runs out adds little
+EXACT_NODE_BUDGET = 1500
+
+#communities with at least this many users are split into groups of about DECOMPOSE_GROUP_SIZE users
+DECOMPOSE_MIN_USERS = 200
+DECOMPOSE_GROUP_SIZE = 50
+
+ENGINES = ("auto", "exact", "annealing", "decomposed")
+
+#(user, chore list) score components remembered between annealing iterations
+COMPONENT_CACHE_SIZE = 100000
+
+#hard constraints (forbidden, pinned, hard caps) that no schedule can satisfy
+#a ValueError so callers that already turn bad input into a 400 keep doing so
+class Infeasible_Constraints(ValueError):
+    pass
+
 class Chore:
     def __init__(self, name: str, amount: int):
         self.name = name
@@ -14,7 +46,10 @@ class User:
     def __init__(self, name: str, max_chores: int, 
                 difficulty: List[int] = None, 
                 hated_chores: List[int] = None,
-                loved_chores: List[int] = None):
+                loved_chores: List[int] = None,
+                forbidden_chores: List[int] = None,
+                pinned_chores: List[int] = None,
+                hard_cap: bool = False):
         self.name = name
         
         if max_chores < 1:
@@ -35,26 +70,184 @@ class User:
         else:
             self.loved_chores = loved_chores
 
+        #hard constraints, never scored, enforced by the scheduler's feasibility masks
+        #forbidden: user is never assigned these chores
+        #pinned: these chores can only go to users that pinned them
+        #hard_cap: max_chores becomes a strict limit instead of a fairness target
+        if forbidden_chores is None or len(forbidden_chores) == 0:
+            self.forbidden_chores = []
+        else:
+            self.forbidden_chores = forbidden_chores
+        if pinned_chores is None or len(pinned_chores) == 0:
+            self.pinned_chores = []
+        else:
+            self.pinned_chores = pinned_chores
+        self.hard_cap = hard_cap
+
 def safe_divide(numerator, denominator):
     if denominator == 0:
         return 0.0
     return numerator/denominator
 
 class Chore_Scheduler:
-    def __init__(self, chores: List[Chore], users: List[User]):
+    #seed makes a run reproducible, without one the global random module is used
+    #history maps user name -> (chores done, capacity offered) in earlier periods, fairness is then cumulative
+    #weights overrides any of DEFAULT_WEIGHTS
+    def __init__(self, chores: List[Chore], users: List[User], seed: int = None, history: Dict = None,
+                 weights: Dict = None):
         if not users or len(users) == 0:
             raise ValueError("Cannot create schedule with no users")
         
         if not chores or len(chores) == 0:
             raise ValueError("Cannot create schedule with no chores")
         
+        self.rng = random if seed is None else random.Random(seed)
         self.chores = chores
         self.chore_index = {chore.name: i for i, chore in enumerate(chores)}
         #rearranges users so users with more chore capacity will get more chores when calling create_initial_schedule 
         self.users = sorted(users, key=lambda x: x.max_chores, reverse=True) 
         self.total_chores = sum(chore.amount for chore in self.chores)
+        self.user_index = {user.name: i for i, user in enumerate(self.users)}
+        self.build_constraint_masks()
+        self.build_component_cache()
+        self.set_weights(weights)
+        self.set_history(history)
         self.schedule = self.create_initial_schedule()
+
+    #precomputes hard constraints as boolean masks (rows follow self.users, columns follow self.chores)
+    #so infeasible moves are never generated or scored
+    def build_constraint_masks(self):
+        user_amount = len(self.users)
+        chore_amount = len(self.chores)
+
+        allowed = np.ones((user_amount, chore_amount), dtype=bool)
+        pinned = np.zeros((user_amount, chore_amount), dtype=bool)
+        for i, user in enumerate(self.users):
+            if user.forbidden_chores:
+                allowed[i, user.forbidden_chores] = False
+            if user.pinned_chores:
+                pinned[i, user.pinned_chores] = True
+
+        #pinned chores can only be done by the users who pinned them
+        pinned_columns = pinned.any(axis=0)
+        allowed[:, pinned_columns] &= pinned[:, pinned_columns]
+
+        #users without a hard cap can take every chore
+        caps = np.array([user.max_chores if user.hard_cap else self.total_chores for user in self.users], dtype=int)
+
+        for j, chore in enumerate(self.chores):
+            if chore.amount > 0 and not allowed[:, j].any():
+                raise Infeasible_Constraints(f"Hard constraints leave no user for chore '{chore.name}'")
+            if chore.amount > np.sum(caps[allowed[:, j]]):
+                raise Infeasible_Constraints(f"Hard capacity caps are too low to cover chore '{chore.name}'")
+        if self.total_chores > np.sum(caps):
+            raise Infeasible_Constraints("Hard capacity caps are too low to cover all chores")
+
+        self.allowed_mask = allowed
+        self.hard_caps = caps
+        self.has_constraints = bool(not allowed.all() or any(user.hard_cap for user in self.users))
     
+    #zobrist style signatures: every chore gets a random 64 bit key and a chore list is summarized by
+    #the sum of its keys, so the same multiset gets the same signature in any order
+    #the cached components do not depend on the weights or history, so it survives set_weights and set_history
+    def build_component_cache(self, size: int = COMPONENT_CACHE_SIZE):
+        key_rng = random.Random(0)
+        self.chore_keys = {chore.name: key_rng.getrandbits(64) for chore in self.chores}
+        self.component_cache = OrderedDict()
+        self.cache_size = size
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    #per user signatures of a schedule, annealing carries them next to its schedules and updates them per move
+    def schedule_signatures(self, schedule: Dict[str, List[str]]) -> Dict[str, int]:
+        return {name: sum(map(self.chore_keys.__getitem__, chores)) for name, chores in schedule.items()}
+
+    #(loved amount, hated amount, difficulty sum) of one user's chore list, least recently used entries are evicted
+    #a known signature of the list makes the lookup O(1), otherwise it is summed here
+    def user_components(self, user_id: int, assigned_chores: List[str], signature: int = None):
+        if signature is None:
+            signature = sum(map(self.chore_keys.__getitem__, assigned_chores))
+        key = (user_id, signature)
+        components = self.component_cache.get(key)
+        if components is not None:
+            self.component_cache.move_to_end(key)
+            self.cache_hits += 1
+            return components
+
+        self.cache_misses += 1
+        user = self.users[user_id]
+        assigned_indices = [self.chore_index[chore] for chore in assigned_chores]
+        loved_amount = sum(1 for id in assigned_indices if id in user.loved_chores)
+        hated_amount = sum(1 for id in assigned_indices if id in user.hated_chores)
+        diff_sum = sum(user.difficulty[id] for id in assigned_indices) if user.difficulty else 0
+
+        components = (loved_amount, hated_amount, diff_sum)
+        self.component_cache[key] = components
+        if len(self.component_cache) > self.cache_size:
+            self.component_cache.popitem(last=False)
+        return components
+
+    def cache_stats(self) -> Dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'entries': len(self.component_cache),
+            'hit_rate': round(self.cache_hits / lookups, 4) if lookups else 0.0
+        }
+
+    #precomputes the per user, per chore terms of evaluation_function (rows follow self.users)
+    #so a schedule can be scored straight from its count matrix
+    def build_score_tables(self):
+        user_amount = len(self.users)
+        chore_amount = len(self.chores)
+
+        loved = np.zeros((user_amount, chore_amount), dtype=float)
+        hated = np.zeros((user_amount, chore_amount), dtype=float)
+        difficulty = np.zeros((user_amount, chore_amount), dtype=float)
+        for i, user in enumerate(self.users):
+            loved[i, list(set(user.loved_chores))] = 1
+            hated[i, list(set(user.hated_chores))] = 1
+            if user.difficulty:
+                difficulty[i] = user.difficulty
+
+        self.loved_matrix = loved
+        self.hated_matrix = hated
+        self.preference_matrix = loved * self.weights['love'] + hated * self.weights['hate']
+        self.difficulty_matrix = difficulty
+        self.has_difficulty = np.array([bool(user.difficulty) for user in self.users])
+        self.user_max_chores = np.array([user.max_chores for user in self.users], dtype=int)
+        self.chore_amounts = np.array([chore.amount for chore in self.chores], dtype=int)
+
+    #objective weights, the score tables are rebuilt so the same scheduler can be re-solved under new weights
+    def set_weights(self, weights: Dict = None):
+        if weights is None:
+            weights = {}
+        if not isinstance(weights, dict):
+            raise ValueError("Weights must be an object")
+        unknown = set(weights) - set(DEFAULT_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown weights: {', '.join(sorted(map(str, unknown)))}")
+        for key, value in weights.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"Weight '{key}' must be a number")
+
+        weights = dict(DEFAULT_WEIGHTS, **weights)
+        if weights['fairness'] < 0:
+            raise ValueError("Fairness weight cannot be negative")
+        if weights['difficulty'] < 0:
+            raise ValueError("Difficulty weight cannot be negative")
+
+        self.weights = {key: float(value) for key, value in weights.items()}
+        self.upper_bound = None
+        self.build_score_tables()
+
+    #past load per user (rows follow self.users), can be swapped between periods without rebuilding the scheduler
+    def set_history(self, history: Dict = None):
+        self.history = history or {}
+        self.past_assigned = np.array([self.history.get(user.name, (0, 0))[0] for user in self.users], dtype=int)
+        self.past_capacity = np.array([self.history.get(user.name, (0, 0))[1] for user in self.users], dtype=int)
+
     def create_initial_schedule(self) -> Dict[str, List[str]]:
         schedule = {user.name: [] for user in self.users}
         user_amount = len(self.users)
@@ -66,12 +259,64 @@ class Chore_Scheduler:
         repeated_chore_list = np.repeat(chore_names, chore_amounts)  
 
         #distributes chores to be half and half (or approximately)
-        for i, chore_name in enumerate(repeated_chore_list):
-            user = self.users[i % user_amount]
-            schedule[user.name].append(chore_name)
+        if not self.has_constraints:
+            for i, chore_name in enumerate(repeated_chore_list):
+                user = self.users[i % user_amount]
+                schedule[user.name].append(chore_name)
+            return schedule
+
+        #same round robin, but skips users that are not allowed the chore or are at their hard cap
+        #most constrained chores are placed first so they are not crowded out
+        loads = np.zeros(user_amount, dtype=int)
+        options = self.allowed_mask.sum(axis=0)
+        order = sorted(range(len(repeated_chore_list)),
+                       key=lambda i: options[self.chore_index[repeated_chore_list[i]]])
+        for i in order:
+            chore_name = repeated_chore_list[i]
+            chore_id = self.chore_index[chore_name]
+            for offset in range(user_amount):
+                user_id = (i + offset) % user_amount
+                if self.allowed_mask[user_id, chore_id] and loads[user_id] < self.hard_caps[user_id]:
+                    break
+            else:
+                #every allowed user is full, shift chores along to make room before giving up
+                if not self.place_by_augmenting_path(schedule, loads, chore_name):
+                    raise Infeasible_Constraints(f"Hard constraints leave no user for chore '{chore_name}'")
+                continue
+            loads[user_id] += 1
+            schedule[self.users[user_id].name].append(chore_name)
 
         return schedule
 
+    #repair step for the round robin, an augmenting path search on the users x chores flow network:
+    #finds a chain where each full user hands one of their chores to the next user allowed to do it,
+    #ending at a user with room, so the first user can take chore_name
+    #when no chain exists the chores cannot all be placed (max flow is below the total amount)
+    def place_by_augmenting_path(self, schedule: Dict[str, List[str]], loads: np.ndarray, chore_name: str) -> bool:
+        starts = np.nonzero(self.allowed_mask[:, self.chore_index[chore_name]])[0].tolist()
+        parent = {user_id: None for user_id in starts}
+        queue = list(starts)
+        for user_id in queue:
+            if loads[user_id] < self.hard_caps[user_id]:
+                break
+            for held in set(schedule[self.users[user_id].name]):
+                for next_id in np.nonzero(self.allowed_mask[:, self.chore_index[held]])[0].tolist():
+                    if next_id not in parent:
+                        parent[next_id] = (user_id, held)
+                        queue.append(next_id)
+        else:
+            return False
+
+        #walk back along the chain, each user passes one chore to the next
+        loads[user_id] += 1
+        while parent[user_id] is not None:
+            previous_id, held = parent[user_id]
+            schedule[self.users[previous_id].name].remove(held)
+            schedule[self.users[user_id].name].append(held)
+            user_id = previous_id
+        schedule[self.users[user_id].name].append(chore_name)
+        return True
+
     #Network fairness index
     #useful as it will rate based on even capacity (equal load)
     #distributed underload fairly
@@ -84,18 +329,20 @@ class Chore_Scheduler:
         return numerator/denominator
 
     #evaluates schedule scores
-    def evaluation_function(self, schedule) -> float:
-        #weights
-        W_LOVE = 5.0
-        W_HATE = -5.0
-        W_DIFFICULTY = 3.0
-
+    #signatures (from schedule_signatures) skip re-summing every user's chore keys
+    def evaluation_function(self, schedule, signatures: Dict[str, int] = None) -> float:
         user_info = {user.name: user for user in self.users}
         user_names = list(schedule.keys())
 
         chore_counts = np.array([len(schedule[name]) for name in user_names])
         user_max_chores = np.array([user_info[name].max_chores for name in user_names])
 
+        #earlier periods count towards fairness
+        if self.history:
+            past = [self.user_index[name] for name in user_names]
+            chore_counts = chore_counts + self.past_assigned[past]
+            user_max_chores = user_max_chores + self.past_capacity[past]
+
         # ---------- Distribution of Fairness -------------
         #big penalty
 
@@ -107,7 +354,7 @@ class Chore_Scheduler:
         )
 
         fairness_score = self.jains_fairness_index(ratios)
-        score = fairness_score * 100.0
+        score = fairness_score * self.weights['fairness']
 
         # ---------- Overload Penalty ------------- 
         #big penalty if unequal overload, jains will distribute underload evenly
@@ -116,18 +363,15 @@ class Chore_Scheduler:
 
         for user_name in user_names:
             user = user_info[user_name]
-            assigned_chores = schedule[user_name]
-            assigned_indices = [self.chore_index[chore] for chore in assigned_chores]
+            #users whose chores did not change since an earlier iteration are a cache hit
+            signature = signatures[user_name] if signatures is not None else None
+            loved_amount, hated_amount, diff_sum = self.user_components(self.user_index[user_name], schedule[user_name], signature)
 
             # ---------- Preferences Bonus / Penalty -------------
-            #small penalty
-            loved_amount = sum(1 for id in assigned_indices if id in user.loved_chores)
-            hated_amount = sum(1 for id in assigned_indices if id in user.hated_chores)
-            
+            #small penalty, loved_amount and hated_amount above
+
             diff_score = 0
             if user.difficulty:
-                diff_sum = sum(user.difficulty[id] for id in assigned_indices)
-                
                 #scales so that if difficulty is too negative, will penalize heavily
                 #if difficulty is positive, simply adds as bonus
                 if diff_sum < 0:
@@ -135,65 +379,157 @@ class Chore_Scheduler:
                     diff_score = -1 * (scaled_diff ** 2)
                 else:
                     diff_score = diff_sum * 1.0
+                diff_score *= self.weights['difficulty']
 
-            score += ((loved_amount * W_LOVE) + (hated_amount * W_HATE) + diff_score)
+            score += ((loved_amount * self.weights['love']) + (hated_amount * self.weights['hate']) + diff_score)
 
         return score
 
-    #changes schedule pairs by swapping or giving chores   
-    def get_neighbors(self, schedule: Dict[str, List[str]], num_swaps) -> List:
+    #changes schedule pairs by swapping or giving chores
+    #returns (neighbor, signatures) pairs, the signatures are updated by the moved chores' keys instead of recomputed
+    def get_neighbors(self, schedule: Dict[str, List[str]], num_swaps, signatures: Dict[str, int] = None) -> List:
         neighbors = []
         user_names = list(schedule.keys())
+        if signatures is None:
+            signatures = self.schedule_signatures(schedule)
 
         if len(user_names) < 2:
-            return [schedule]
+            return [(schedule, signatures)]
         
+        keys = self.chore_keys
         for _ in range(num_swaps):
             schedule_copy = copy.deepcopy(schedule)
-            strategy = random.choice(['reassign', 'swap'])
-            user_1, user_2 = random.sample(user_names, 2)
+            signatures_copy = dict(signatures)
+            if self.has_constraints:
+                self.apply_feasible_move(schedule_copy, user_names, signatures_copy)
+                neighbors.append((schedule_copy, signatures_copy))
+                continue
+
+            strategy = self.rng.choice(['reassign', 'swap'])
+            user_1, user_2 = self.rng.sample(user_names, 2)
 
             if len(schedule_copy[user_1]) > 0 and len(schedule_copy[user_2]) > 0 and strategy == 'swap':
-                id_1 = random.randint(0, len(schedule_copy[user_1]) - 1)
-                id_2 = random.randint(0, len(schedule_copy[user_2]) - 1)
+                id_1 = self.rng.randint(0, len(schedule_copy[user_1]) - 1)
+                id_2 = self.rng.randint(0, len(schedule_copy[user_2]) - 1)
                 schedule_copy[user_1][id_1], schedule_copy[user_2][id_2] = schedule_copy[user_2][id_2], schedule_copy[user_1][id_1]
+                moved = keys[schedule_copy[user_1][id_1]] - keys[schedule_copy[user_2][id_2]]
+                signatures_copy[user_1] += moved
+                signatures_copy[user_2] -= moved
             elif len(schedule_copy[user_1]) > 0:
-                chore_i = random.randint(0, len(schedule_copy[user_1]) - 1)
+                chore_i = self.rng.randint(0, len(schedule_copy[user_1]) - 1)
                 chore = schedule_copy[user_1].pop(chore_i)
                 schedule_copy[user_2].append(chore)
+                signatures_copy[user_1] -= keys[chore]
+                signatures_copy[user_2] += keys[chore]
 
-            neighbors.append(schedule_copy)
+            neighbors.append((schedule_copy, signatures_copy))
         return neighbors
 
+    #same moves as get_neighbors, but partners are only drawn from users the masks allow
+    #leaves the schedule unchanged if there is no feasible move, signatures (if given) are kept in step
+    def apply_feasible_move(self, schedule: Dict[str, List[str]], user_names: List[str], signatures: Dict[str, int] = None):
+        givers = [name for name in user_names if len(schedule[name]) > 0]
+        if not givers:
+            return
+        user_1 = self.rng.choice(givers)
+        u_1 = self.user_index[user_1]
+        id_1 = self.rng.randint(0, len(schedule[user_1]) - 1)
+        c_1 = self.chore_index[schedule[user_1][id_1]]
+        strategy = self.rng.choice(['reassign', 'swap'])
+
+        if strategy == 'swap':
+            #user_2 must be allowed chore_1 and hold a chore user_1 is allowed
+            partners = []
+            for name in user_names:
+                u_2 = self.user_index[name]
+                if name == user_1 or not self.allowed_mask[u_2, c_1]:
+                    continue
+                ids = [k for k, chore in enumerate(schedule[name]) if self.allowed_mask[u_1, self.chore_index[chore]]]
+                if ids:
+                    partners.append((name, ids))
+            if partners:
+                user_2, ids = self.rng.choice(partners)
+                id_2 = self.rng.choice(ids)
+                schedule[user_1][id_1], schedule[user_2][id_2] = schedule[user_2][id_2], schedule[user_1][id_1]
+                if signatures is not None:
+                    moved = self.chore_keys[schedule[user_1][id_1]] - self.chore_keys[schedule[user_2][id_2]]
+                    signatures[user_1] += moved
+                    signatures[user_2] -= moved
+                return
+
+        #reassign: user_2 must be allowed chore_1 and be under their hard cap
+        receivers = [
+            name for name in user_names
+            if name != user_1
+            and self.allowed_mask[self.user_index[name], c_1]
+            and len(schedule[name]) < self.hard_caps[self.user_index[name]]
+        ]
+        if receivers:
+            user_2 = self.rng.choice(receivers)
+            chore = schedule[user_1].pop(id_1)
+            schedule[user_2].append(chore)
+            if signatures is not None:
+                signatures[user_1] -= self.chore_keys[chore]
+                signatures[user_2] += self.chore_keys[chore]
+
     #evaluates which schedule is the very best based on score
-    def simulated_annealing(self, max_iterations: int = 500, initial_temp: float = 100.0, cooling_rate: float = 0.01):
+    #gap_tolerance stops early once the best score is within that relative gap of score_upper_bound
+    #with checkpoint_path the search state is saved every checkpoint_every iterations,
+    #and a run started with an existing checkpoint for the same problem carries on from it
+    def simulated_annealing(self, max_iterations: int = 500, initial_temp: float = 100.0, cooling_rate: float = 0.01,
+                            gap_tolerance: float = None, checkpoint_path: str = None, checkpoint_every: int = 100):
         current_schedule = copy.deepcopy(self.schedule)
-        current_score = self.evaluation_function(current_schedule)
+        current_signatures = self.schedule_signatures(current_schedule)
+        current_score = self.evaluation_function(current_schedule, current_signatures)
 
         best_schedule = current_schedule
         best_score = current_score
         
         temp = initial_temp
+        self.engine_used = "annealing"
+        self.iterations_used = 0
+        start = 0
+
+        fingerprint = None
+        if checkpoint_path is not None:
+            fingerprint = self.problem_fingerprint(initial_temp, cooling_rate)
+            state = self.load_checkpoint(checkpoint_path, fingerprint)
+            if state is not None:
+                start = state['iteration']
+                current_schedule, current_score = state['current_schedule'], state['current_score']
+                current_signatures = self.schedule_signatures(current_schedule)
+                best_schedule, best_score = state['best_schedule'], state['best_score']
+                temp = state['temp']
+                self.iterations_used = start
+
+        for i in range(start, max_iterations):
+            if checkpoint_path is not None and i > start and i % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint_path, fingerprint, i, temp, current_schedule, current_score, best_schedule, best_score)
+
+            if gap_tolerance is not None and self.optimality_gap(best_score) <= gap_tolerance:
+                break
+            self.iterations_used = i + 1
 
-        for i in range(max_iterations):
             num_neighbors = min(self.total_chores * 2, 20)
-            neighbors = self.get_neighbors(current_schedule, num_neighbors)
-            neighbor_id = random.randint(0, len(neighbors) - 1)
-            neighbor_schedule = neighbors.pop(neighbor_id)
-            neighbor_score = self.evaluation_function(neighbor_schedule)
+            neighbors = self.get_neighbors(current_schedule, num_neighbors, current_signatures)
+            neighbor_id = self.rng.randint(0, len(neighbors) - 1)
+            neighbor_schedule, neighbor_signatures = neighbors.pop(neighbor_id)
+            neighbor_score = self.evaluation_function(neighbor_schedule, neighbor_signatures)
 
             delta = neighbor_score - current_score
             #good choice
             if delta > 0:
                 current_schedule =  neighbor_schedule
+                current_signatures = neighbor_signatures
                 current_score = neighbor_score
             else:
                 #possible bad choice
                 acceptance_probability = 0
                 if temp > 0:
                     acceptance_probability = math.exp(delta/temp)
-                if random.random() < acceptance_probability:
+                if self.rng.random() < acceptance_probability:
                     current_schedule =  neighbor_schedule
+                    current_signatures = neighbor_signatures
                     current_score = neighbor_score
                 #no change to current schedule happened
 
@@ -204,9 +540,413 @@ class Chore_Scheduler:
             
             #reduces temperature using exponential cooling
             temp = initial_temp * math.exp(-cooling_rate * i)
-            
+
+        if checkpoint_path is not None:
+            self.save_checkpoint(checkpoint_path, fingerprint, self.iterations_used, temp,
+                                 current_schedule, current_score, best_schedule, best_score)
         return best_schedule, best_score
+
+    #identifies the problem and cooling schedule a checkpoint belongs to
+    def problem_fingerprint(self, initial_temp: float, cooling_rate: float) -> str:
+        parts = [repr((chore.name, chore.amount)) for chore in self.chores]
+        parts += [repr((user.name, user.max_chores, user.difficulty, user.loved_chores, user.hated_chores,
+                        user.forbidden_chores, user.pinned_chores, user.hard_cap)) for user in self.users]
+        parts.append(repr(sorted((name, tuple(load)) for name, load in self.history.items())))
+        parts.append(repr(sorted(self.weights.items())))
+        parts.append(repr((initial_temp, cooling_rate)))
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    #schedules are stored as chore index arrays plus per user lengths (in self.users order),
+    #the whole state is a compressed numpy archive written to a temp file and renamed into place
+    def save_checkpoint(self, path: str, fingerprint: str, iteration: int, temp: float,
+                        current_schedule, current_score, best_schedule, best_score):
+        rng_version, rng_words, rng_gauss = self.rng.getstate()
+        arrays = {
+            'fingerprint': np.array(fingerprint),
+            'iteration': np.array(iteration),
+            'temp': np.array(temp),
+            'current_score': np.array(current_score),
+            'best_score': np.array(best_score),
+            'rng_version': np.array(rng_version),
+            'rng_words': np.array(rng_words, dtype=np.uint32),
+            'rng_gauss': np.array(np.nan if rng_gauss is None else rng_gauss),
+        }
+        for prefix, schedule in (('current', current_schedule), ('best', best_schedule)):
+            arrays[prefix + '_lengths'] = np.array([len(schedule[user.name]) for user in self.users], dtype=np.int32)
+            arrays[prefix + '_chores'] = np.array([self.chore_index[chore] for user in self.users for chore in schedule[user.name]],
+                                                  dtype=np.int32)
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(buffer.getvalue())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    #returns the saved search state, or None if there is no checkpoint for this problem
+    def load_checkpoint(self, path: str, fingerprint: str):
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as data:
+            if str(data['fingerprint']) != fingerprint:
+                return None
+
+            state = {
+                'iteration': int(data['iteration']),
+                'temp': float(data['temp']),
+                'current_score': float(data['current_score']),
+                'best_score': float(data['best_score']),
+            }
+            for prefix in ('current', 'best'):
+                chores = data[prefix + '_chores'].tolist()
+                schedule = {}
+                position = 0
+                for user, length in zip(self.users, data[prefix + '_lengths'].tolist()):
+                    schedule[user.name] = [self.chores[j].name for j in chores[position:position + length]]
+                    position += length
+                state[prefix + '_schedule'] = schedule
+
+            gauss = float(data['rng_gauss'])
+            self.rng.setstate((int(data['rng_version']), tuple(data['rng_words'].tolist()), None if math.isnan(gauss) else gauss))
+        return state
+
+    #upper bound on evaluation_function over every feasible schedule
+    #root of the branch and bound tables, computed once
+    #each unit goes to exactly one allowed user, and a user's difficulty score is at most the sum of the
+    #positive difficulties of their own units, so every unit is bounded by its best allowed user
+    def score_upper_bound(self) -> float:
+        if getattr(self, 'upper_bound', None) is None:
+            positive_difficulty = np.maximum(0, self.difficulty_matrix) * self.weights['difficulty']
+            unit_scores = np.where(self.allowed_mask, self.preference_matrix + positive_difficulty, -np.inf)
+            best_unit = np.where(self.chore_amounts > 0, unit_scores.max(axis=0), 0.0)
+            self.upper_bound = float(self.weights['fairness'] + np.sum(best_unit * self.chore_amounts))
+        return self.upper_bound
+
+    #relative distance between a score and the upper bound, 0 means provably optimal
+    def optimality_gap(self, score: float) -> float:
+        bound = self.score_upper_bound()
+        return max(0.0, bound - score) / max(abs(bound), 1.0)
+
+    def optimality_report(self, score: float) -> Dict:
+        proven = getattr(self, 'engine_used', None) == "exact"
+        return {
+            'objective': round(float(score), 3),
+            'upper_bound': round(self.score_upper_bound(), 3),
+            'gap': 0.0 if proven else round(self.optimality_gap(score), 4),
+            'proven_optimal': proven,
+            'engine': getattr(self, 'engine_used', None),
+            'iterations': getattr(self, 'iterations_used', 0)
+        }
     
+    #objective parts that do not depend on the weights, used to compare schedules across weight settings
+    #fairness is Jain's index, preference is loved minus hated units, difficulty is the summed difficulty of every unit
+    def score_components(self, schedule: Dict[str, List[str]]) -> Dict[str, float]:
+        counts = self.schedule_to_counts(schedule)
+        chore_counts = counts.sum(axis=1) + self.past_assigned
+        user_max_chores = self.user_max_chores + self.past_capacity
+        ratios = np.divide(
+            chore_counts,
+            user_max_chores,
+            out=np.zeros_like(chore_counts, dtype=float),
+            where=user_max_chores != 0
+        )
+        return {
+            'fairness': round(float(self.jains_fairness_index(ratios)), 4),
+            'preference': int(np.sum(counts * self.loved_matrix) - np.sum(counts * self.hated_matrix)),
+            'difficulty': int(np.sum(counts * self.difficulty_matrix))
+        }
+
+    #fairness-first to preference-first: love, hate and difficulty scaled from a quarter to four times the current weights
+    def default_weight_settings(self) -> List[Dict]:
+        settings = []
+        for scale in (0.25, 0.5, 1.0, 2.0, 4.0):
+            settings.append({'love': self.weights['love'] * scale, 'hate': self.weights['hate'] * scale,
+                             'difficulty': self.weights['difficulty'] * scale})
+        return settings
+
+    #solves once per weight setting on this same scheduler (masks and tables are shared)
+    #the first setting gets the full iteration budget, later ones warm start from whichever earlier
+    #solution scores best under their weights and get sweep_iterations
+    #returns every solution with its components, flagged when it is on the Pareto front
+    def weight_sweep(self, settings: List[Dict] = None, max_iterations: int = 500, sweep_iterations: int = None,
+                     initial_temp: float = 100.0, cooling_rate: float = 0.01, engine: str = "auto") -> List[Dict]:
+        if settings is None:
+            settings = self.default_weight_settings()
+        if not isinstance(settings, list) or not settings or not all(isinstance(weights, dict) for weights in settings):
+            raise ValueError("Sweep settings must be a non-empty list of weight objects")
+        sweep_iterations = sweep_iterations or max(1, max_iterations // 4)
+        original_weights = dict(self.weights)
+        original_schedule = self.schedule
+
+        results = []
+        try:
+            for k, weights in enumerate(settings):
+                #a setting only overrides the weights it names, the rest stay as the scheduler was built with
+                self.set_weights(dict(original_weights, **(weights or {})))
+                if results:
+                    self.schedule = max((r['schedule'] for r in results), key=self.evaluation_function)
+                best_schedule, best_score = self.solve(max_iterations=max_iterations if k == 0 else sweep_iterations,
+                                                       initial_temp=initial_temp, cooling_rate=cooling_rate, engine=engine)
+                results.append({
+                    'weights': dict(self.weights),
+                    'schedule': best_schedule,
+                    'score': float(best_score),
+                    'components': self.score_components(best_schedule)
+                })
+        finally:
+            self.set_weights(original_weights)
+            self.schedule = original_schedule
+
+        #a solution is dominated if another is at least as good in every component and better in one
+        keys = ('fairness', 'preference', 'difficulty')
+        for result in results:
+            mine = result['components']
+            result['pareto'] = not any(
+                all(other['components'][key] >= mine[key] for key in keys)
+                and any(other['components'][key] > mine[key] for key in keys)
+                for other in results
+            )
+        return results
+
+    #count matrix form of a schedule, counts[user, chore] = times the user does the chore
+    def schedule_to_counts(self, schedule: Dict[str, List[str]]) -> np.ndarray:
+        counts = np.zeros((len(self.users), len(self.chores)), dtype=int)
+        for user_name, assigned_chores in schedule.items():
+            user_id = self.user_index[user_name]
+            for chore in assigned_chores:
+                counts[user_id, self.chore_index[chore]] += 1
+        return counts
+
+    def counts_to_schedule(self, counts: np.ndarray) -> Dict[str, List[str]]:
+        schedule = {}
+        for i, user in enumerate(self.users):
+            schedule[user.name] = [chore.name for j, chore in enumerate(self.chores) for _ in range(int(counts[i, j]))]
+        return schedule
+
+    #scores the difficulty sums the same way evaluation_function does
+    def difficulty_scores(self, diff_sums: np.ndarray) -> np.ndarray:
+        scores = np.where(diff_sums < 0, -1 * (diff_sums / W_DIFFICULTY) ** 2, diff_sums) * self.weights['difficulty']
+        return np.where(self.has_difficulty, scores, 0.0)
+
+    #same score as evaluation_function, computed from the count matrix
+    def evaluate_counts(self, counts: np.ndarray) -> float:
+        chore_counts = counts.sum(axis=1) + self.past_assigned
+        user_max_chores = self.user_max_chores + self.past_capacity
+        ratios = np.divide(
+            chore_counts,
+            user_max_chores,
+            out=np.zeros_like(chore_counts, dtype=float),
+            where=user_max_chores != 0
+        )
+
+        fairness_score = self.jains_fairness_index(ratios)
+        score = fairness_score * self.weights['fairness']
+        if np.sum(ratios > 1.0) > 0 and fairness_score < 1.0:
+            score -= (np.sum(np.maximum(0, ratios - 1.0))) * (1 + (1-fairness_score) * 1000)
+
+        score += np.sum(counts * self.preference_matrix)
+        score += np.sum(self.difficulty_scores(np.sum(counts * self.difficulty_matrix, axis=1)))
+        return float(score)
+
+    #tables for an upper bound on the best score reachable once chores order[:k] are fixed
+    #fairness is at most its weight and overload only subtracts, so the bound is
+    #fairness weight + preferences so far + best preference per remaining chore unit
+    #+ each user's difficulty score if they also got every remaining chore they find easy
+    def build_bound_tables(self, order: List[int]):
+        preference = np.where(self.allowed_mask, self.preference_matrix, -np.inf)
+        best_preference = np.maximum(0, preference.max(axis=0)) * self.chore_amounts
+        positive_difficulty = np.where(self.allowed_mask, np.maximum(0, self.difficulty_matrix), 0) * self.chore_amounts
+
+        user_amount = len(self.users)
+        preference_rest = np.zeros(len(order) + 1)
+        difficulty_rest = np.zeros((len(order) + 1, user_amount))
+        for k in range(len(order) - 1, -1, -1):
+            preference_rest[k] = preference_rest[k + 1] + best_preference[order[k]]
+            difficulty_rest[k] = difficulty_rest[k + 1] + positive_difficulty[:, order[k]]
+        return preference_rest, difficulty_rest
+
+    #number of count matrices the exact search would have to enumerate without pruning
+    def exact_search_size(self) -> int:
+        size = 1
+        for j, chore in enumerate(self.chores):
+            #a chore with no units has one split, even when nobody is allowed to do it
+            if chore.amount == 0:
+                continue
+            options = int(self.allowed_mask[:, j].sum())
+            size *= math.comb(chore.amount + options - 1, options - 1)
+            if size > EXACT_SEARCH_LIMIT:
+                break
+        return size
+
+    #exact search over count matrices, chore by chore, pruning with build_bound_tables
+    #returns a provably optimal schedule, so it is only meant for small instances
+    #with a node_budget it gives up once that many nodes are visited, returns None and leaves the
+    #best schedule found so far in self.schedule
+    def branch_and_bound(self, node_budget: int = None):
+        #largest chores first so the bound tightens quickly
+        order = sorted(range(len(self.chores)), key=lambda j: self.chores[j].amount, reverse=True)
+        preference_rest, difficulty_rest = self.build_bound_tables(order)
+
+        counts = np.zeros((len(self.users), len(self.chores)), dtype=int)
+        loads = np.zeros(len(self.users), dtype=int)
+
+        #the initial schedule is feasible, so it is the first incumbent
+        best_counts = self.schedule_to_counts(self.schedule)
+        best_score = self.evaluate_counts(best_counts)
+        nodes = 0
+
+        def place(k, preference_score, diff_sums):
+            nonlocal best_counts, best_score, nodes
+
+            nodes += 1
+            if node_budget is not None and nodes > node_budget:
+                return
+
+            if k == len(order):
+                score = self.evaluate_counts(counts)
+                if score > best_score:
+                    best_counts = counts.copy()
+                    best_score = score
+                return
+
+            bound = self.weights['fairness'] + preference_score + preference_rest[k] + np.sum(self.difficulty_scores(diff_sums + difficulty_rest[k]))
+            if bound <= best_score:
+                return
+
+            chore_id = order[k]
+            candidates = np.flatnonzero(self.allowed_mask[:, chore_id])
+            split(k, chore_id, candidates, 0, self.chores[chore_id].amount, preference_score, diff_sums)
+
+        #enumerates every way to split the chore's units between the allowed users
+        def split(k, chore_id, candidates, c, remaining, preference_score, diff_sums):
+            user_id = candidates[c]
+            room = self.hard_caps[user_id] - loads[user_id]
+            if c == len(candidates) - 1:
+                options = [remaining] if remaining <= room else []
+            else:
+                options = range(min(remaining, room), -1, -1)
+
+            for amount in options:
+                if node_budget is not None and nodes > node_budget:
+                    return
+                counts[user_id, chore_id] = amount
+                loads[user_id] += amount
+                new_preference = preference_score + amount * self.preference_matrix[user_id, chore_id]
+                new_diff_sums = diff_sums.copy()
+                new_diff_sums[user_id] += amount * self.difficulty_matrix[user_id, chore_id]
+
+                if c == len(candidates) - 1:
+                    place(k + 1, new_preference, new_diff_sums)
+                else:
+                    split(k, chore_id, candidates, c + 1, remaining - amount, new_preference, new_diff_sums)
+
+                loads[user_id] -= amount
+                counts[user_id, chore_id] = 0
+
+        place(0, 0.0, np.zeros(len(self.users)))
+
+        if node_budget is not None and nodes > node_budget:
+            self.schedule = self.counts_to_schedule(best_counts)
+            return None
+
+        self.engine_used = "exact"
+        self.iterations_used = 0
+        best_schedule = self.counts_to_schedule(best_counts)
+        return best_schedule, self.evaluation_function(best_schedule)
+
+    #picks the search engine: exact branch and bound for small instances, simulated annealing otherwise
+    def solve(self, max_iterations: int = 500, initial_temp: float = 100.0, cooling_rate: float = 0.01, engine: str = "auto",
+              gap_tolerance: float = None, workers: int = None, checkpoint_path: str = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'")
+
+        if engine == "decomposed" or (engine == "auto" and len(self.users) >= DECOMPOSE_MIN_USERS):
+            return self.solve_decomposed(max_iterations=max_iterations, initial_temp=initial_temp, cooling_rate=cooling_rate,
+                                         gap_tolerance=gap_tolerance, workers=workers)
+        if engine == "exact":
+            return self.branch_and_bound()
+        if engine == "auto" and self.exact_search_size() <= EXACT_SEARCH_LIMIT:
+            result = self.branch_and_bound(node_budget=EXACT_NODE_BUDGET)
+            if result is not None:
+                return result
+            #out of budget, annealing carries on from the best schedule the search found
+        return self.simulated_annealing(max_iterations=max_iterations, initial_temp=initial_temp, cooling_rate=cooling_rate,
+                                        gap_tolerance=gap_tolerance, checkpoint_path=checkpoint_path)
+
+    #splits users into groups that each look like a small copy of the community
+    #users are sorted by favourite chore and capacity, then dealt out round robin,
+    #so every group gets a mix of preferences to trade with and a similar share of capacity
+    def partition_users(self, group_size: int = DECOMPOSE_GROUP_SIZE) -> List[List[int]]:
+        group_amount = max(1, math.ceil(len(self.users) / group_size))
+        appeal = np.where(self.allowed_mask, self.preference_matrix + self.difficulty_matrix, -np.inf)
+        favourite = np.argmax(appeal, axis=1)
+        order = sorted(range(len(self.users)), key=lambda i: (favourite[i], -self.users[i].max_chores))
+        return [order[g::group_amount] for g in range(group_amount)]
+
+    #splits every chore's amount between groups in proportion to group capacity (largest remainder)
+    #only groups with a user allowed to do the chore get a share
+    def split_chores(self, groups: List[List[int]]) -> np.ndarray:
+        capacity = np.array([sum(self.users[i].max_chores for i in group) for group in groups], dtype=float)
+        shares = np.zeros((len(groups), len(self.chores)), dtype=int)
+
+        for j, chore in enumerate(self.chores):
+            eligible = np.array([self.allowed_mask[group, j].any() for group in groups])
+            weights = np.where(eligible, capacity, 0.0)
+            exact = chore.amount * weights / weights.sum()
+            shares[:, j] = np.floor(exact).astype(int)
+            leftover = chore.amount - shares[:, j].sum()
+            for g in np.argsort(-(exact - shares[:, j]), kind="stable")[:leftover]:
+                shares[g, j] += 1
+        return shares
+
+    #hierarchical mode for large communities
+    #solves each group on its own (in parallel), then re-anneals neighbouring pairs of groups
+    #so chores can move across group boundaries, work grows about linearly with community size
+    def solve_decomposed(self, max_iterations: int = 500, initial_temp: float = 100.0, cooling_rate: float = 0.01,
+                         gap_tolerance: float = None, workers: int = None, group_size: int = DECOMPOSE_GROUP_SIZE):
+        groups = self.partition_users(group_size)
+        shares = self.split_chores(groups)
+        options = {'max_iterations': max_iterations, 'initial_temp': initial_temp,
+                   'cooling_rate': cooling_rate, 'gap_tolerance': gap_tolerance}
+
+        tasks = []
+        for g, group in enumerate(groups):
+            group_chores = [Chore(chore.name, int(shares[g, j])) for j, chore in enumerate(self.chores)]
+            group_users = [self.users[i] for i in group]
+            tasks.append((group_chores, group_users, self.rng.randrange(2**32), options, None, self.history, self.weights))
+
+        iterations = 0
+        try:
+            merged = {}
+            for schedule, used in run_subproblems(tasks, workers):
+                merged.update(schedule)
+                iterations += used
+
+            #coordinating pass, even pairs of groups first, then odd pairs, pairs in a pass do not overlap
+            for start in (0, 1):
+                tasks = []
+                for g in range(start, len(groups) - 1, 2):
+                    pair_users = [self.users[i] for i in groups[g] + groups[g + 1]]
+                    pair_schedule = {user.name: merged[user.name] for user in pair_users}
+                    counts = self.schedule_to_counts(pair_schedule).sum(axis=0)
+                    pair_chores = [Chore(chore.name, int(counts[j])) for j, chore in enumerate(self.chores)]
+                    tasks.append((pair_chores, pair_users, self.rng.randrange(2**32), options, pair_schedule, self.history, self.weights))
+                for schedule, used in run_subproblems(tasks, workers):
+                    merged.update(schedule)
+                    iterations += used
+        except Infeasible_Constraints:
+            #a group's share broke its hard constraints, solve the whole community instead
+            return self.simulated_annealing(max_iterations=max_iterations, initial_temp=initial_temp, cooling_rate=cooling_rate,
+                                            gap_tolerance=gap_tolerance)
+
+        self.engine_used = "decomposed"
+        #annealing iterations summed over every subproblem that ran
+        self.iterations_used = iterations
+        best_schedule = {user.name: merged[user.name] for user in self.users}
+        return best_schedule, self.evaluation_function(best_schedule)
+
     #calculates the mean of the user's chores if they are based on best difficulty
     def calculate_ideal_difficulty(self, schedule) -> Dict[str, float]:
         user_info = {user.name: user for user in self.users}
@@ -285,11 +1025,9 @@ class Chore_Scheduler:
         for user_name in user_names:
             user = user_info[user_name]
             assigned_chores = schedule[user_name]
-            assigned_indices = [self.chore_index[chore] for chore in assigned_chores]
 
-            #for preferences
-            loved_amount = sum(1 for id in assigned_indices if id in user.loved_chores)
-            hated_amount = sum(1 for id in assigned_indices if id in user.hated_chores)
+            #for preferences, the final schedule was usually scored already so this is a cache hit
+            loved_amount, hated_amount, diff_sum = self.user_components(self.user_index[user_name], assigned_chores)
             
             total_loved_assigned += loved_amount
             total_hated_assigned += hated_amount
@@ -300,7 +1038,7 @@ class Chore_Scheduler:
                 #calculates the difference
                 #this is done so that we can calculate deviations based on difficulties tailored to user's difficulties
                 #instead of calculating deviations between other user's difficulties
-                diff_avg = np.mean([user.difficulty[i] for i in assigned_indices])
+                diff_avg = diff_sum / len(assigned_chores) if assigned_chores else float('nan')
                 ideal_avg = ideal_difficulties[user_name]
                 difficulty_deviations.append(abs(diff_avg - ideal_avg))
 
@@ -389,5 +1127,57 @@ class Chore_Scheduler:
             'capacity_ratio': round(capacity_ratio, 2)
         }
 
-       
-app = Flask(__name__)
\ No newline at end of file
+#solves one group (or pair of groups) of a decomposed schedule, module level so process pools can pickle it
+#with a starting schedule the group is re-annealed from there, otherwise it is solved from scratch
+def solve_subproblem(chores: List[Chore], users: List[User], seed: int, options: Dict, schedule: Dict[str, List[str]] = None,
+                     history: Dict = None, weights: Dict = None):
+    if sum(chore.amount for chore in chores) == 0:
+        return {user.name: [] for user in users}, 0
+
+    scheduler = Chore_Scheduler(chores, users, seed=seed, history=history, weights=weights)
+    if schedule is None:
+        best_schedule, _ = scheduler.solve(**options)
+    else:
+        scheduler.schedule = {user.name: list(schedule[user.name]) for user in scheduler.users}
+        best_schedule, _ = scheduler.simulated_annealing(**options)
+    return best_schedule, scheduler.iterations_used
+
+#runs subproblems in a process pool, or inline when there is only one worker or one task
+#each result is (schedule, annealing iterations used)
+def run_subproblems(tasks: List, workers: int = None) -> List:
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return [solve_subproblem(*task) for task in tasks]
+
+    return list(worker_pool(workers).map(solve_subproblem, *zip(*tasks)))
+
+#process pools are kept between solves so workers only start (and warm up) once
+worker_pools = {}
+
+def worker_pool(workers: int):
+    if workers not in worker_pools:
+        #loaded on first use, most runs never need a pool
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        #pools are usually created from a request thread, and forking a threaded process can leave the child
+        #stuck on a lock some other thread held, so workers are forked from a single threaded fork server
+        #that imports the solver once, instead of from the server itself
+        #(scripts that solve with several workers need the usual if __name__ == "__main__" guard)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        if "forkserver" in methods and __name__ != "__main__":
+            context.set_forkserver_preload([__name__])
+        worker_pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=warm_up)
+    return worker_pools[workers]
+
+#runs a tiny problem through every engine so the first real request does not pay for
+#lazy numpy setup and cold code paths, also used to start pool workers hot
+def warm_up():
+    chores = [Chore("warm_up_0", 2), Chore("warm_up_1", 2)]
+    users = [User("warm_up_0", 2, difficulty=[1, -1], loved_chores=[0]), User("warm_up_1", 2, hated_chores=[1])]
+    scheduler = Chore_Scheduler(chores, users, seed=0)
+    scheduler.branch_and_bound()
+    schedule, score = scheduler.simulated_annealing(max_iterations=5)
+    scheduler.accuracy_score(schedule)
+    scheduler.optimality_report(score)
\ No newline at end of file
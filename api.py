@@ -1,88 +1,501 @@
+import heapq
+import itertools
+import json
+import math
+import os
+import threading
+import time
 from flask import Flask, request, jsonify
-from Group_Chore_Scheduler import Chore, User, Chore_Scheduler  
+from Group_Chore_Scheduler import Chore, User, Chore_Scheduler, ENGINES, EXACT_SEARCH_LIMIT, warm_up
+from rotation import Rotation_Store, Rotation_Scheduler
+from payload import load_json, parse_problem, payload_size, compact_schedule, RESPONSE_FORMATS
+
+#request size limits
+MAX_USERS = 5000
+MAX_TOTAL_CHORES = 100000
+MAX_ITERATIONS = 20000
+MAX_PERIODS = 52
+MAX_SWEEP_SETTINGS = 20
+#requests are downscaled to fit this estimated solve time, and rejected if even MIN_ITERATIONS does not fit
+MAX_REQUEST_SECONDS = 10.0
+MIN_ITERATIONS = 50
+#solves running at once, and requests one client may have open at once
+#(SCHEDULER_CLIENT_CONCURRENCY raises the per client limit, e.g. for local load tests)
+MAX_CONCURRENT_SOLVES = os.cpu_count() or 1
+MAX_CLIENT_CONCURRENCY = int(os.environ.get("SCHEDULER_CLIENT_CONCURRENCY", 2))
+#how long a request may wait for a solve slot
+QUEUE_TIMEOUT = 30.0
+#SQLite file holding rotation history
+ROTATION_DB = os.environ.get("ROTATION_DB", "rotation.db")
 app = Flask(
     __name__,
     static_folder="static",
     static_url_path=""  # <-- THIS makes /script.js and /style.css work
 )
 
+#coalesces concurrent calls with the same key into one computation
+#the first caller (leader) runs it, later callers wait and get the same result or error
+#results that only concern the leader (see shared) are not handed on, those followers try again themselves
+class Single_Flight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.computed = 0
+        self.coalesced = 0
+
+    def do(self, key, compute):
+        while True:
+            result = self.do_once(key, compute)
+            if result is not None:
+                return result
+
+    #the leader's result, or None when a follower got one it should not share
+    def do_once(self, key, compute):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self.calls[key] = call
+                self.computed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'] if self.shared(call['result']) else None
+
+        try:
+            call['result'] = compute()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            #later identical requests start a fresh computation
+            with self.lock:
+                del self.calls[key]
+            call['done'].set()
+
+    #(body, status) results: the leader's client quota (429) and its queue wait (503) say nothing about
+    #other callers, so they only go to the leader
+    @staticmethod
+    def shared(result) -> bool:
+        return result[1] not in (429, 503)
+
+    def stats(self):
+        with self.lock:
+            return {'computed': self.computed, 'coalesced': self.coalesced, 'in_flight': len(self.calls)}
+
+schedule_flight = Single_Flight()
+
+#measures how long one unit of annealing work takes on this machine
+#one unit = one user or chore slot touched by one neighbor copy or evaluation
+#can be pinned with the SCHEDULER_SECONDS_PER_UNIT environment variable
+def calibrate_seconds_per_unit() -> float:
+    if os.environ.get("SCHEDULER_SECONDS_PER_UNIT"):
+        return float(os.environ["SCHEDULER_SECONDS_PER_UNIT"])
+
+    chores = [Chore(f"chore_{j}", 5) for j in range(10)]
+    users = [User(f"user_{i}", max_chores=5, difficulty=[(i + j) % 5 - 2 for j in range(10)]) for i in range(10)]
+    scheduler = Chore_Scheduler(chores, users, seed=0)
+    iterations = 50
+    start = time.perf_counter()
+    scheduler.simulated_annealing(max_iterations=iterations)
+    elapsed = time.perf_counter() - start
+    return elapsed / annealing_units(scheduler.total_chores, len(users), iterations)
+
+def annealing_units(total_chores: int, user_amount: int, iterations: int) -> int:
+    num_neighbors = min(total_chores * 2, 20)
+    return iterations * (num_neighbors + 1) * (user_amount + total_chores)
+
+#admission layer in front of the solver: size limits, cost based downscaling,
+#per client concurrency quotas and a cheapest-first queue for solve slots
+class Admission_Controller:
+    def __init__(self, slots: int = MAX_CONCURRENT_SOLVES, per_client: int = MAX_CLIENT_CONCURRENCY):
+        self.cond = threading.Condition()
+        self.slots = slots
+        self.per_client = per_client
+        self.active = 0
+        self.waiting = []
+        self.order = itertools.count()
+        self.client_requests = {}
+        self.seconds_per_unit = None
+        self.counts = {'admitted': 0, 'downscaled': 0, 'rejected': 0, 'timed_out': 0}
+
+    #sizes up a payload before any solver objects are built
+    #a sweep solves once with max_iterations and then once per remaining setting with sweep_iterations
+    #returns the (possibly downscaled) payload and an admission report, or an error body and status
+    def estimate(self, data, sweep: bool = False):
+        amounts, user_amount = payload_size(data)
+        total_chores = sum(amounts)
+        annealing = dict(data.get("annealing", {}) or {})
+        iterations = int(annealing.get("max_iterations", 500))
+        engine = data.get("engine", "auto") or "auto"
+        #rotations solve one schedule per period
+        periods = int(data.get("periods", 1))
+        if sweep:
+            sweep_settings = data.get("sweep")
+            if sweep_settings is not None and not isinstance(sweep_settings, list):
+                return None, ({"error": "'sweep' must be a list of weight objects"}, 400)
+            settings = len(sweep_settings or [None] * 5)
+            sweep_iterations = data.get("sweep_iterations")
+            sweep_iterations = max(1, iterations // 4) if sweep_iterations is None else int(sweep_iterations)
+            if not 1 <= settings <= MAX_SWEEP_SETTINGS:
+                return None, ({"error": f"'sweep' must have between 1 and {MAX_SWEEP_SETTINGS} settings"}, 413)
+        else:
+            settings, sweep_iterations = 1, 0
+
+        if user_amount > MAX_USERS:
+            return None, ({"error": f"Too many users, the limit is {MAX_USERS}"}, 413)
+        if total_chores > MAX_TOTAL_CHORES:
+            return None, ({"error": f"Too many chores, the limit is {MAX_TOTAL_CHORES} in total"}, 413)
+        if not 1 <= periods <= MAX_PERIODS:
+            return None, ({"error": f"'periods' must be between 1 and {MAX_PERIODS}"}, 413)
+
+        if self.seconds_per_unit is None:
+            self.seconds_per_unit = calibrate_seconds_per_unit()
+
+        downscaled = False
+        #forcing the exact engine on a big instance would explode, let the dispatcher choose instead
+        if engine == "exact" and user_amount > 0:
+            leaves = 1
+            for amount in amounts:
+                leaves *= math.comb(amount + user_amount - 1, user_amount - 1)
+                if leaves > EXACT_SEARCH_LIMIT:
+                    engine = "auto"
+                    downscaled = True
+                    break
+
+        if iterations > MAX_ITERATIONS:
+            iterations = MAX_ITERATIONS
+            downscaled = True
+        if sweep and not 1 <= sweep_iterations <= MAX_ITERATIONS:
+            sweep_iterations = min(max(sweep_iterations, 1), MAX_ITERATIONS)
+            downscaled = True
+
+        #decomposition anneals every group and then every pair of groups, about twice the work
+        scale = (2 if engine == "decomposed" else 1) * periods
+        unit_seconds = scale * self.seconds_per_unit * annealing_units(total_chores, user_amount, 1)
+        total_iterations = iterations + (settings - 1) * sweep_iterations
+        if total_iterations * unit_seconds > MAX_REQUEST_SECONDS:
+            #every solve of a sweep is cut by the same factor
+            factor = MAX_REQUEST_SECONDS / (total_iterations * unit_seconds)
+            iterations = int(iterations * factor)
+            sweep_iterations = max(1, int(sweep_iterations * factor)) if sweep else 0
+            total_iterations = iterations + (settings - 1) * sweep_iterations
+            downscaled = True
+            if iterations < MIN_ITERATIONS:
+                with self.cond:
+                    self.counts['rejected'] += 1
+                return None, ({"error": "Request is too large to schedule within the time budget"}, 413)
+
+        if downscaled:
+            annealing["max_iterations"] = iterations
+            data = dict(data, annealing=annealing, engine=engine)
+            if sweep:
+                data["sweep_iterations"] = sweep_iterations
+            with self.cond:
+                self.counts['downscaled'] += 1
+
+        report = {
+            'estimated_seconds': round(total_iterations * unit_seconds, 3),
+            'max_iterations': iterations,
+            'downscaled': downscaled
+        }
+        return (data, report), None
+
+    #per client concurrency quota, counts requests that compute, requests that join one are free
+    def enter_client(self, client) -> bool:
+        with self.cond:
+            if self.client_requests.get(client, 0) >= self.per_client:
+                self.counts['rejected'] += 1
+                return False
+            self.client_requests[client] = self.client_requests.get(client, 0) + 1
+            return True
+
+    def leave_client(self, client):
+        with self.cond:
+            self.client_requests[client] -= 1
+            if self.client_requests[client] == 0:
+                del self.client_requests[client]
+
+    #takes the client's quota slot and then runs compute, called inside single flight so only the leader
+    #of a group of identical requests (a household behind one NAT address opening the UI) counts
+    def run_for_client(self, client, cost: float, compute):
+        if not self.enter_client(client):
+            return {"error": "Too many concurrent requests from this client"}, 429
+        try:
+            return self.run(cost, compute)
+        finally:
+            self.leave_client(client)
+
+    #runs compute once a solve slot is free, cheapest waiting request first
+    def run(self, cost: float, compute):
+        ticket = (cost, next(self.order))
+        deadline = time.monotonic() + QUEUE_TIMEOUT
+        with self.cond:
+            heapq.heappush(self.waiting, ticket)
+            while self.active >= self.slots or self.waiting[0] != ticket:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.waiting.remove(ticket)
+                    heapq.heapify(self.waiting)
+                    self.counts['timed_out'] += 1
+                    self.cond.notify_all()
+                    return {"error": "Server is busy, try again later"}, 503
+                self.cond.wait(remaining)
+            heapq.heappop(self.waiting)
+            self.active += 1
+            self.counts['admitted'] += 1
+            #the next ticket may also fit in a free slot
+            self.cond.notify_all()
+
+        try:
+            return compute()
+        finally:
+            with self.cond:
+                self.active -= 1
+                self.cond.notify_all()
+
+    def stats(self):
+        with self.cond:
+            return dict(self.counts, active=self.active, queued=len(self.waiting), seconds_per_unit=self.seconds_per_unit)
+
+admission = Admission_Controller()
+
+#warms the solver and calibrates admission so the first request starts hot
+#called by the server entry points (serve.py, the gunicorn post_fork hook) rather than on import,
+#the solver's pool workers re-run the launching script and must not redo this or load Flask
+def prewarm():
+    warm_up()
+    if admission.seconds_per_unit is None:
+        admission.seconds_per_unit = calibrate_seconds_per_unit()
+
 @app.get("/")
 def index():
     # Serve index.html from the static folder
     return app.send_static_file("index.html")
 
-@app.post("/schedule")
-def make_schedule():
-    data = request.get_json(force=True)
-
-    chores = [
-        Chore(c["name"], int(c["amount"]))
-        for c in data.get("chores", [])
-        if c.get("name") and int(c.get("amount", 0)) > 0 
-    ]
-    
-    if not chores:
-        return jsonify({"error": "No chores provided"}), 400
-
-    #map chore names to index/order
-    chore_names = [c.name for c in chores]
-    chore_index = {name: idx for idx, name in enumerate(chore_names)}
-
-    difficulties = data.get("difficulties", {}) or {}
-    loved_payload = data.get("loved", {}) or {}
-    hated_payload = data.get("hated", {}) or {}
-    users_payload = data.get("users", [])
-
-    users = []
-    for u in users_payload:
-        name = u.get("name")
-        if not name:
-            continue
-        max_chores = int(u.get("max_chores", 0))
-
-        #build difficulty list aligning with chore order
-        user_diff_by_name = difficulties.get(name, {}) or {}
-        diff_list = [
-            int(user_diff_by_name.get(chore_name, 0))
-            for chore_name in chore_names
-        ]
-        
-        #loved/hated chores come from the dropdown UI as names
-        loved_names = loved_payload.get(name, []) or []
-        hated_names = hated_payload.get(name, []) or []
-
-        loved_indices = [
-            chore_index[ch]
-            for ch in loved_names
-            if ch in chore_index
-        ]
-        hated_indices = [
-            chore_index[ch]
-            for ch in hated_names
-            if ch in chore_index
-        ]
-
-        users.append(User(name, max_chores, difficulty=diff_list, hated_chores=hated_indices, loved_chores=loved_indices,))
-
-    if not users:
-        return jsonify({"error": "No users provided"}), 400
-
-    scheduler = Chore_Scheduler(chores, users)
-
+#solver settings from a request payload, raises ValueError for an unknown engine
+def solve_options(data):
     annealing = data.get("annealing", {}) or {}
-    max_iterations = int(annealing.get("max_iterations", 500))
-    initial_temp = float(annealing.get("initial_temp", 100.0))
-    cooling_rate = float(annealing.get("cooling_rate", 0.01))
+    #stops annealing once the schedule is provably within this relative gap of optimal
+    gap_tolerance = annealing.get("gap_tolerance")
+    #"auto" solves small requests exactly, splits large communities into groups and anneals the rest
+    engine = data.get("engine", "auto") or "auto"
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'")
+
+    return {
+        'max_iterations': int(annealing.get("max_iterations", 500)),
+        'initial_temp': float(annealing.get("initial_temp", 100.0)),
+        'cooling_rate': float(annealing.get("cooling_rate", 0.01)),
+        'gap_tolerance': None if gap_tolerance is None else float(gap_tolerance),
+        'engine': engine
+    }
+
+#"seed" from a payload, None when there is none
+#raises ValueError for anything that is not an integer, so it becomes a 400 like other bad input
+def parse_seed(data):
+    seed = data.get("seed")
+    if seed is None:
+        return None
+    try:
+        return int(seed)
+    except (TypeError, ValueError):
+        raise ValueError("'seed' must be an integer")
+
+#builds the /schedule response body and status from a request payload
+def build_schedule(data):
+    try:
+        chores, users = parse_problem(data)
+        #same payload and seed give the same schedule
+        seed = parse_seed(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
 
-    #added quality metrics in generated schedule with simulated annealing
-    best_schedule, best_score = scheduler.simulated_annealing(max_iterations=max_iterations, initial_temp=initial_temp, cooling_rate=cooling_rate)
+    try:
+        scheduler = Chore_Scheduler(chores, users, seed=seed, weights=data.get("weights"))
+    except ValueError as e:
+        #hard constraints that cannot be satisfied, or bad weights
+        return {"error": str(e)}, 400
+
+    try:
+        options = solve_options(data)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    response_format = data.get("format", "full") or "full"
+    if response_format not in RESPONSE_FORMATS:
+        return {"error": f"Unknown format '{response_format}'"}, 400
+
+    #added quality metrics in generated schedule
+    best_schedule, best_score = scheduler.solve(**options)
     quality = scheduler.accuracy_score(best_schedule)
+    if response_format != "full":
+        best_schedule, quality = compact_schedule(scheduler, best_schedule, quality, response_format)
 
-    return jsonify({
+    return {
         "schedule": best_schedule,
         "quality": quality,
-    })
+        "optimality": scheduler.optimality_report(best_score),
+    }, 200
+
+@app.post("/schedule")
+def make_schedule():
+    try:
+        data = load_json(request.get_data())
+        admitted, rejection = admission.estimate(data)
+    except (ValueError, TypeError, AttributeError):
+        return jsonify({"error": "Malformed request payload"}), 400
+
+    if rejection is not None:
+        body, status = rejection
+        return jsonify(body), status
+    data, report = admitted
+
+    client = request.remote_addr
+    #identical payloads (seed included) arriving together share one computation
+    key = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    body, status = schedule_flight.do(key, lambda: admission.run_for_client(client, report['estimated_seconds'],
+                                                                           lambda: build_schedule(data)))
+
+    if status == 200:
+        body = dict(body, admission=report)
+    return jsonify(body), status
+
+rotation_store = None
+rotation_lock = threading.Lock()
+
+def get_rotation_store():
+    global rotation_store
+    with rotation_lock:
+        if rotation_store is None:
+            rotation_store = Rotation_Store(ROTATION_DB)
+        return rotation_store
+
+#plans "periods" periods for a household starting at "start_period" (default: the period after the last stored one)
+#stored periods from start_period onward are re-planned, earlier ones count towards fairness
+def build_rotation(data):
+    household = data.get("household")
+    if not household:
+        return {"error": "No household provided"}, 400
+    if not isinstance(household, str):
+        return {"error": "'household' must be a string"}, 400
+
+    try:
+        chores, users = parse_problem(data)
+        options = solve_options(data)
+        seed = parse_seed(data)
+        start_period = data.get("start_period")
+        if start_period is not None:
+            #periods are numbered from 1, anything else would be stored as a period no plan can reach
+            if isinstance(start_period, bool) or not isinstance(start_period, (int, str)) or not str(start_period).isdigit() \
+                    or int(start_period) < 1:
+                raise ValueError("'start_period' must be a whole number of 1 or more")
+            start_period = int(start_period)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    store = get_rotation_store()
+
+    try:
+        #without a start_period the plan continues after the last stored period
+        plans = Rotation_Scheduler(store, household).plan(chores, users, start_period,
+                                                          int(data.get("periods", 1)), seed=seed,
+                                                          weights=data.get("weights"), **options)
+    except ValueError as e:
+        #hard constraints that cannot be satisfied
+        return {"error": str(e)}, 400
+
+    history = store.history(household)
+    return {
+        "household": household,
+        "periods": plans,
+        "history": {user: {"assigned": assigned, "capacity": capacity} for user, (assigned, capacity) in history.items()},
+    }, 200
+
+@app.post("/rotation")
+def make_rotation():
+    try:
+        data = load_json(request.get_data())
+        admitted, rejection = admission.estimate(data)
+    except (ValueError, TypeError, AttributeError):
+        return jsonify({"error": "Malformed request payload"}), 400
+
+    if rejection is not None:
+        body, status = rejection
+        return jsonify(body), status
+    data, report = admitted
+
+    #not coalesced, every call updates the stored history
+    body, status = admission.run_for_client(request.remote_addr, report['estimated_seconds'], lambda: build_rotation(data))
+
+    if status == 200:
+        body = dict(body, admission=report)
+    return jsonify(body), status
+
+#solves the payload once per weight setting ("sweep", a list of weight objects, or a default
+#fairness-first to preference-first range) and returns every solution with its Pareto flag
+def build_sweep(data):
+    try:
+        chores, users = parse_problem(data)
+        options = solve_options(data)
+        scheduler = Chore_Scheduler(chores, users, seed=parse_seed(data), weights=data.get("weights"))
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    response_format = data.get("format", "full") or "full"
+    if response_format not in RESPONSE_FORMATS:
+        return {"error": f"Unknown format '{response_format}'"}, 400
+
+    sweep_iterations = data.get("sweep_iterations")
+    try:
+        results = scheduler.weight_sweep(data.get("sweep"), max_iterations=options['max_iterations'],
+                                         sweep_iterations=None if sweep_iterations is None else int(sweep_iterations),
+                                         initial_temp=options['initial_temp'], cooling_rate=options['cooling_rate'],
+                                         engine=options['engine'])
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    for result in results:
+        quality = scheduler.accuracy_score(result['schedule'])
+        if response_format != "full":
+            result['schedule'], quality = compact_schedule(scheduler, result['schedule'], quality, response_format)
+        result['quality'] = quality
+    return {"frontier": results}, 200
+
+@app.post("/sweep")
+def make_sweep():
+    try:
+        data = load_json(request.get_data())
+        admitted, rejection = admission.estimate(data, sweep=True)
+    except (ValueError, TypeError, AttributeError):
+        return jsonify({"error": "Malformed request payload"}), 400
+
+    if rejection is not None:
+        body, status = rejection
+        return jsonify(body), status
+    data, report = admitted
+
+    client = request.remote_addr
+    key = "sweep:" + json.dumps(data, sort_keys=True, separators=(",", ":"))
+    body, status = schedule_flight.do(key, lambda: admission.run_for_client(client, report['estimated_seconds'],
+                                                                           lambda: build_sweep(data)))
+
+    if status == 200:
+        body = dict(body, admission=report)
+    return jsonify(body), status
+
+@app.get("/metrics")
+def metrics():
+    return jsonify({"schedule": schedule_flight.stats(), "admission": admission.stats()})
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    #pool workers re-run the launching script before they take work, which would load Flask and build
+    #this app in every one of them, so the development server is started from serve.py instead
+    import sys
+    serve = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serve.py")
+    os.execv(sys.executable, [sys.executable, serve] + sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,246 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterator, Set
+from Group_Chore_Scheduler import Chore_Scheduler, ENGINES
+from payload import load_json, parse_problem, compact_schedule, RESPONSE_FORMATS
+
+#offline bulk scheduling, no web stack involved
+#reads problem instances as a stream, solves them across a process pool and writes
+#one NDJSON result per instance as soon as it finishes, the output doubles as the checkpoint
+#
+#NDJSON input: one /schedule payload per line, with an optional "id"
+#CSV input: one row per (user, chore) pair, rows of an instance are consecutive
+#  id,user,max_chores,chore,amount,difficulty,preference
+#  house_1,alice,3,dishes,2,5,loved
+#  house_1,alice,3,trash,1,0,
+#  house_1,bob,3,dishes,2,-3,hated
+
+CSV_COLUMNS = ("id", "user", "max_chores", "chore", "amount", "difficulty", "preference")
+
+def read_ndjson(path: str) -> Iterator[Dict]:
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = load_json(line)
+            except ValueError:
+                record = {"error": "Malformed JSON line"}
+            if not isinstance(record, dict):
+                record = {"error": "Line is not a JSON object"}
+            record.setdefault("id", line_number)
+            yield record
+
+def read_csv(path: str) -> Iterator[Dict]:
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in CSV_COLUMNS[:5] if c not in (reader.fieldnames or [])]
+        if missing:
+            raise SystemExit(f"CSV input is missing columns: {', '.join(missing)}")
+
+        #a bad cell only fails its own instance, like a malformed NDJSON line
+        for instance_id, rows in itertools.groupby(reader, key=lambda row: row["id"]):
+            try:
+                yield csv_instance(instance_id, rows)
+            except ValueError as e:
+                yield {"id": instance_id, "error": str(e)}
+
+def csv_int(row: Dict, column: str) -> int:
+    value = (row.get(column) or "").strip()
+    try:
+        return int(value or 0)
+    except ValueError:
+        raise ValueError(f"Column '{column}' must be a whole number, got '{value}'") from None
+
+#turns the rows of one instance into a /schedule payload
+def csv_instance(instance_id: str, rows) -> Dict:
+    users = {}
+    chores = {}
+    difficulties = {}
+    loved = {}
+    hated = {}
+    for row in rows:
+        user, chore = row["user"], row["chore"]
+        users.setdefault(user, {"name": user, "max_chores": csv_int(row, "max_chores")})
+        chores.setdefault(chore, {"name": chore, "amount": csv_int(row, "amount")})
+        difficulties.setdefault(user, {})[chore] = csv_int(row, "difficulty")
+        preference = (row.get("preference") or "").strip().lower()
+        if preference == "loved":
+            loved.setdefault(user, []).append(chore)
+        elif preference == "hated":
+            hated.setdefault(user, []).append(chore)
+
+    return {
+        "id": instance_id,
+        "users": list(users.values()),
+        "chores": list(chores.values()),
+        "difficulties": difficulties,
+        "loved": loved,
+        "hated": hated
+    }
+
+#solves one instance, module level so the process pool can pickle it
+#instance fields (engine, annealing, seed, format) win over the command line defaults
+def solve_record(record: Dict, defaults: Dict) -> Dict:
+    result = {"id": record.get("id")}
+    if "error" in record:
+        result["error"] = record["error"]
+        return result
+
+    start = time.perf_counter()
+    try:
+        chores, users = parse_problem(record)
+        seed = record.get("seed", defaults["seed"])
+        scheduler = Chore_Scheduler(chores, users, seed=None if seed is None else int(seed), weights=record.get("weights"))
+
+        annealing = dict(defaults["annealing"], **(record.get("annealing") or {}))
+        engine = record.get("engine") or defaults["engine"]
+        response_format = record.get("format") or defaults["format"]
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown format '{response_format}'")
+
+        best_schedule, best_score = scheduler.solve(
+            max_iterations=int(annealing.get("max_iterations", 500)),
+            initial_temp=float(annealing.get("initial_temp", 100.0)),
+            cooling_rate=float(annealing.get("cooling_rate", 0.01)),
+            gap_tolerance=None if annealing.get("gap_tolerance") is None else float(annealing["gap_tolerance"]),
+            engine=engine,
+            #instances already run in parallel, a nested pool would only oversubscribe
+            workers=1
+        )
+        quality = scheduler.accuracy_score(best_schedule)
+        if response_format != "full":
+            best_schedule, quality = compact_schedule(scheduler, best_schedule, quality, response_format)
+    except Exception as e:
+        #one malformed instance is written as an error row instead of aborting the whole run
+        result["error"] = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+        return result
+
+    result["schedule"] = best_schedule
+    result["quality"] = quality
+    result["optimality"] = scheduler.optimality_report(best_score)
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+#ids already written to the output, cuts off a half written last line left by an interruption
+#only the tail is read to find the last newline and the lines are streamed, so memory does not grow with the file
+def completed_ids(path: str, block_size: int = 1 << 16) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        end = 0
+        position = size
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                end = position + newline + 1
+                break
+        if end < size:
+            f.truncate(end)
+
+    done = set()
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+#keeps at most max_in_flight instances submitted, so memory stays bounded however large the input is
+def run(records: Iterator[Dict], out, defaults: Dict, workers: int, max_in_flight: int, done: Set[str]) -> Dict:
+    stats = {"solved": 0, "failed": 0, "skipped": 0, "score_total": 0.0}
+
+    def write(result):
+        out.write(json.dumps(result, separators=(",", ":"), default=float) + "\n")
+        out.flush()
+        if "error" in result:
+            stats["failed"] += 1
+        else:
+            stats["solved"] += 1
+            stats["score_total"] += result["quality"]["score"]
+
+    def pending():
+        for record in records:
+            if str(record.get("id")) in done:
+                stats["skipped"] += 1
+                continue
+            yield record
+
+    if workers <= 1:
+        for record in pending():
+            write(solve_record(record, defaults))
+        return stats
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for record in pending():
+            if len(in_flight) >= max_in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(future.result())
+            in_flight.add(pool.submit(solve_record, record, defaults))
+        for future in as_completed(in_flight):
+            write(future.result())
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule many chore instances from a file without the web server.")
+    parser.add_argument("input", help="NDJSON or CSV file of problem instances")
+    parser.add_argument("output", help="NDJSON file results are written to")
+    parser.add_argument("--input-format", choices=("ndjson", "csv"), help="defaults to the input file extension")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-in-flight", type=int, help="instances held in memory at once, defaults to 4 per worker")
+    parser.add_argument("--resume", action="store_true", help="skip instances already in the output file")
+    parser.add_argument("--engine", choices=ENGINES, default="auto")
+    parser.add_argument("--format", choices=RESPONSE_FORMATS, default="counts")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--max-iterations", type=int, default=500)
+    parser.add_argument("--initial-temp", type=float, default=100.0)
+    parser.add_argument("--cooling-rate", type=float, default=0.01)
+    parser.add_argument("--gap-tolerance", type=float)
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or ("csv" if args.input.lower().endswith(".csv") else "ndjson")
+    records = read_csv(args.input) if input_format == "csv" else read_ndjson(args.input)
+    defaults = {
+        "engine": args.engine,
+        "format": args.format,
+        "seed": args.seed,
+        "annealing": {
+            "max_iterations": args.max_iterations,
+            "initial_temp": args.initial_temp,
+            "cooling_rate": args.cooling_rate,
+            "gap_tolerance": args.gap_tolerance
+        }
+    }
+
+    if args.resume:
+        done = completed_ids(args.output)
+        mode = "a"
+    else:
+        done = set()
+        mode = "w"
+
+    start = time.perf_counter()
+    with open(args.output, mode) as out:
+        stats = run(records, out, defaults, args.workers, args.max_in_flight or 4 * args.workers, done)
+    elapsed = time.perf_counter() - start
+
+    mean_score = stats["score_total"] / stats["solved"] if stats["solved"] else 0.0
+    print(f"solved {stats['solved']}, failed {stats['failed']}, skipped {stats['skipped']} "
+          f"in {elapsed:.1f}s, mean accuracy score {mean_score:.1f}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+#read by gunicorn when it is started from this directory: gunicorn -w 4 api:app
+#each worker warms the solver and calibrates admission once after it is forked, the app no longer
+#does this on import so the solver's pool workers never repeat it
+def post_fork(server, worker):
+    from api import prewarm
+
+    prewarm()
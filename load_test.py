@@ -0,0 +1,300 @@
+import argparse
+import csv
+import json
+import os
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+import numpy as np
+
+#local load test for the /schedule endpoint
+#starts the app in a subprocess (or targets --url), replays a seeded mix of synthetic instances
+#at one or more concurrency levels and writes one result row per level and instance size
+#
+#  python load_test.py --concurrency 1,4,8 --requests 200 --output results.csv
+#  python load_test.py --server-command "gunicorn -w 4 -b 127.0.0.1:{port} api:app"
+
+#users, chores and the largest amount per chore of each instance size
+SIZES = {
+    "small": (4, 6, 3),
+    "medium": (20, 30, 5),
+    "large": (100, 120, 5)
+}
+DEFAULT_MIX = "small=6,medium=3,large=1"
+RESULT_COLUMNS = ("concurrency", "size", "requests", "ok", "rejected", "errors", "error_rate", "seconds",
+                  "requests_per_second", "mean_ms", "p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms",
+                  "rejected_mean_ms", "cpu_ms_per_request")
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        size, _, share = part.partition("=")
+        size = size.strip()
+        if size not in SIZES:
+            raise SystemExit(f"Unknown instance size '{size}', choose from {', '.join(SIZES)}")
+        mix[size] = float(share or 1)
+    return mix
+
+#one /schedule payload of the given size, the index is used as its seed so no two payloads are
+#identical and the server cannot coalesce them
+def make_instance(rng: random.Random, size: str, index: int, max_iterations: int) -> Dict:
+    user_amount, chore_amount, max_amount = SIZES[size]
+    chores = [{"name": f"chore_{j}", "amount": rng.randint(1, max_amount)} for j in range(chore_amount)]
+    chore_names = [c["name"] for c in chores]
+    total = sum(c["amount"] for c in chores)
+
+    users = []
+    difficulties = {}
+    loved = {}
+    hated = {}
+    for i in range(user_amount):
+        name = f"user_{i}"
+        #capacity spread around an even share so some instances are overloaded and some underloaded
+        users.append({"name": name, "max_chores": max(1, round(total / user_amount * rng.uniform(0.7, 1.3)))})
+        if rng.random() < 0.5:
+            difficulties[name] = {chore: rng.randint(-5, 5) for chore in chore_names}
+        picks = rng.sample(chore_names, min(4, chore_amount))
+        loved[name] = picks[:2]
+        hated[name] = picks[2:]
+
+    return {
+        "chores": chores,
+        "users": users,
+        "difficulties": difficulties,
+        "loved": loved,
+        "hated": hated,
+        "seed": index,
+        "format": "counts",
+        "annealing": {"max_iterations": max_iterations}
+    }
+
+#(size, encoded payload) pairs drawn from the mix, the same seed gives the same requests
+def make_requests(seed: int, mix: Dict[str, float], amount: int, max_iterations: int, offset: int = 0) -> List:
+    rng = random.Random(seed)
+    sizes = list(mix)
+    shares = [mix[size] for size in sizes]
+    requests = []
+    for index in range(offset, offset + amount):
+        size = rng.choices(sizes, weights=shares)[0]
+        requests.append((size, json.dumps(make_instance(rng, size, index, max_iterations)).encode()))
+    return requests
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(command: str, port: int, client_concurrency: int, timeout: float = 60.0) -> subprocess.Popen:
+    if command:
+        args = shlex.split(command.format(port=port))
+    else:
+        args = [sys.executable, "-m", "flask", "--app", "api", "run", "--port", str(port), "--with-threads", "--no-reload"]
+
+    env = dict(os.environ,
+               SCHEDULER_CLIENT_CONCURRENCY=str(client_concurrency),
+               ROTATION_DB=os.path.join(tempfile.mkdtemp(), "rotation.db"))
+    server = subprocess.Popen(args, cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited with code {server.returncode} before it was ready")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1).read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit(f"Server did not answer within {timeout:.0f}s")
+
+#cpu seconds used so far by a process and everything running under it (gunicorn workers included)
+#read from /proc, None where that is not available
+def server_cpu_seconds(pid: int) -> Optional[float]:
+    if not os.path.isdir("/proc"):
+        return None
+
+    parents = {}
+    times = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                #the command name may contain spaces, fields are counted from after it
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        parents[int(entry)] = int(fields[1])
+        times[int(entry)] = sum(int(t) for t in fields[11:15])
+
+    tree = {pid}
+    grew = True
+    while grew:
+        children = {child for child, parent in parents.items() if parent in tree} - tree
+        tree |= children
+        grew = bool(children)
+    if pid not in times:
+        return None
+    return sum(times.get(p, 0) for p in tree) / os.sysconf("SC_CLK_TCK")
+
+#sends every request with the given number of client threads
+#returns (size, status, seconds) per request, status 0 means the request never got a response
+def drive(url: str, requests: List, concurrency: int, timeout: float) -> List:
+    results = []
+    lock = threading.Lock()
+    pending = iter(requests)
+
+    def client():
+        while True:
+            with lock:
+                item = next(pending, None)
+            if item is None:
+                return
+            size, body = item
+            req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except OSError:
+                status = 0
+            elapsed = time.perf_counter() - start
+            with lock:
+                results.append((size, status, elapsed))
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+#429 and 503 are the server shedding load on purpose and are counted apart from real errors
+#latencies are over successful responses only, fast rejections would otherwise make an overloaded server look quick
+#seconds is None for per size rows, their requests ran interleaved with the other sizes so only the level has a throughput
+def summarize(concurrency: int, size: str, results: List, seconds: Optional[float], cpu_seconds: Optional[float]) -> Dict:
+    ok = [elapsed for _, status, elapsed in results if status == 200]
+    rejected = [elapsed for _, status, elapsed in results if status in (429, 503)]
+    errors = len(results) - len(ok) - len(rejected)
+    latencies = np.array(ok) * 1000.0
+    p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99]) if len(latencies) else (0.0,) * 4
+
+    return {
+        "concurrency": concurrency,
+        "size": size,
+        "requests": len(results),
+        "ok": len(ok),
+        "rejected": len(rejected),
+        "errors": errors,
+        "error_rate": round((errors + len(rejected)) / len(results), 4) if results else 0.0,
+        "seconds": None if seconds is None else round(seconds, 3),
+        "requests_per_second": None if seconds is None else round(len(results) / seconds, 2) if seconds > 0 else 0.0,
+        "mean_ms": round(float(latencies.mean()), 2) if len(latencies) else 0.0,
+        "p50_ms": round(float(p50), 2),
+        "p90_ms": round(float(p90), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(latencies.max()), 2) if len(latencies) else 0.0,
+        "rejected_mean_ms": round(float(np.mean(rejected)) * 1000.0, 2) if rejected else None,
+        "cpu_ms_per_request": None if cpu_seconds is None or not results else round(cpu_seconds / len(results) * 1000.0, 2)
+    }
+
+#one row for all requests of a level, then one per instance size
+#throughput and cpu are only measured for the level as a whole
+def level_rows(concurrency: int, results: List, seconds: float, cpu_seconds: Optional[float]) -> List[Dict]:
+    rows = [summarize(concurrency, "all", results, seconds, cpu_seconds)]
+    for size in SIZES:
+        sized = [r for r in results if r[0] == size]
+        if sized:
+            rows.append(summarize(concurrency, size, sized, None, None))
+    return rows
+
+def write_results(path: str, rows: List[Dict], config: Dict):
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w") as f:
+            json.dump({"config": config, "results": rows}, f, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the /schedule endpoint with concurrent synthetic clients.")
+    parser.add_argument("--concurrency", default="1,4", help="comma separated client counts, one run per level")
+    parser.add_argument("--requests", type=int, default=100, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=5, help="requests sent before measuring, not reported")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="instance sizes and their shares, e.g. small=6,medium=3,large=1")
+    parser.add_argument("--max-iterations", type=int, default=200, help="annealing iterations asked for by each request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a request counts as failed")
+    parser.add_argument("--url", help="base URL of a server that is already running, instead of starting one")
+    parser.add_argument("--server-command", help="command that starts the server, {port} is filled in; defaults to flask run")
+    parser.add_argument("--output", help="JSON or CSV file the results are written to")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    mix = parse_mix(args.mix)
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        port = free_port()
+        server = start_server(args.server_command, port, max(levels))
+        base_url = f"http://127.0.0.1:{port}"
+    url = base_url + "/schedule"
+
+    rows = []
+    try:
+        if args.warmup:
+            drive(url, make_requests(args.seed + 1, mix, args.warmup, args.max_iterations, offset=-args.warmup), 1, args.timeout)
+
+        for level in levels:
+            #every level replays the same requests so levels can be compared
+            requests = make_requests(args.seed, mix, args.requests, args.max_iterations)
+            cpu_before = server_cpu_seconds(server.pid) if server else None
+            start = time.perf_counter()
+            results = drive(url, requests, level, args.timeout)
+            seconds = time.perf_counter() - start
+            cpu_after = server_cpu_seconds(server.pid) if server else None
+            cpu_seconds = None if cpu_before is None or cpu_after is None else cpu_after - cpu_before
+
+            level_results = level_rows(level, results, seconds, cpu_seconds)
+            rows.extend(level_results)
+            total = level_results[0]
+            cpu = "n/a" if total["cpu_ms_per_request"] is None else f"{total['cpu_ms_per_request']:.1f}ms"
+            print(f"concurrency {level}: {total['requests_per_second']:.1f} req/s, p50 {total['p50_ms']:.0f}ms, "
+                  f"p99 {total['p99_ms']:.0f}ms, errors {total['errors']}, rejected {total['rejected']}, "
+                  f"cpu/request {cpu}", file=sys.stderr)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        write_results(args.output, rows, {
+            "url": base_url,
+            "server_command": None if args.url else args.server_command or "flask run --with-threads",
+            "cpu_count": os.cpu_count(),
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "mix": mix,
+            "max_iterations": args.max_iterations,
+            "seed": args.seed
+        })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import json
+from typing import Dict, List, Tuple
+import numpy as np
+from Group_Chore_Scheduler import Chore, User
+
+#"full" repeats a chore name once per unit, "counts" sends {user: {chore: count}},
+#"indexed" sends name tables plus sparse [chore_index, count] pairs per user
+RESPONSE_FORMATS = ("full", "counts", "indexed")
+
+#orjson decodes large payloads several times faster, the standard library is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def load_json(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+#builds chores and users from a /schedule payload, either format
+#raises ValueError with a message that can be returned to the client
+def parse_problem(data: Dict) -> Tuple[List[Chore], List[User]]:
+    if not isinstance(data, dict):
+        raise ValueError("Payload must be a JSON object")
+    if data.get("columnar") is not None:
+        return parse_columnar(data["columnar"])
+    return parse_objects(data)
+
+#chore amounts and user count of a payload, without building any solver objects
+def payload_size(data: Dict) -> Tuple[List[int], int]:
+    columns = data.get("columnar")
+    if columns is not None:
+        return [int(a) for a in columns.get("amounts", [])], len(columns.get("users", []))
+    amounts = [int(c["amount"]) for c in data.get("chores", []) if c.get("name") and int(c.get("amount", 0)) > 0]
+    return amounts, sum(1 for u in data.get("users", []) if u.get("name"))
+
+#object format used by the web UI, per user maps keyed by chore name
+def parse_objects(data: Dict) -> Tuple[List[Chore], List[User]]:
+    chores = [
+        Chore(c["name"], int(c["amount"]))
+        for c in data.get("chores", [])
+        if c.get("name") and int(c.get("amount", 0)) > 0
+    ]
+
+    if not chores:
+        raise ValueError("No chores provided")
+
+    #map chore names to index/order
+    chore_names = [c.name for c in chores]
+    chore_index = {name: idx for idx, name in enumerate(chore_names)}
+
+    difficulties = data.get("difficulties", {}) or {}
+    loved_payload = data.get("loved", {}) or {}
+    hated_payload = data.get("hated", {}) or {}
+    forbidden_payload = data.get("forbidden", {}) or {}
+    pinned_payload = data.get("pinned", {}) or {}
+    users_payload = data.get("users", [])
+
+    users = []
+    for u in users_payload:
+        name = u.get("name")
+        if not name:
+            continue
+        max_chores = int(u.get("max_chores", 0))
+
+        #build difficulty list aligning with chore order
+        user_diff_by_name = difficulties.get(name, {}) or {}
+        diff_list = [
+            int(user_diff_by_name.get(chore_name, 0))
+            for chore_name in chore_names
+        ]
+
+        #loved/hated chores come from the dropdown UI as names
+        loved_names = loved_payload.get(name, []) or []
+        hated_names = hated_payload.get(name, []) or []
+
+        loved_indices = [
+            chore_index[ch]
+            for ch in loved_names
+            if ch in chore_index
+        ]
+        hated_indices = [
+            chore_index[ch]
+            for ch in hated_names
+            if ch in chore_index
+        ]
+
+        #hard constraints, also sent as chore names
+        forbidden_indices = [
+            chore_index[ch]
+            for ch in forbidden_payload.get(name, []) or []
+            if ch in chore_index
+        ]
+        pinned_indices = [
+            chore_index[ch]
+            for ch in pinned_payload.get(name, []) or []
+            if ch in chore_index
+        ]
+        hard_cap = bool(u.get("hard_cap", False))
+
+        users.append(User(name, max_chores, difficulty=diff_list, hated_chores=hated_indices, loved_chores=loved_indices,
+                          forbidden_chores=forbidden_indices, pinned_chores=pinned_indices, hard_cap=hard_cap))
+
+    if not users:
+        raise ValueError("No users provided")
+
+    return chores, users
+
+#columnar format for big instances, validated and loaded as whole arrays:
+#{"chores": [names], "amounts": [ints], "users": [names], "max_chores": [ints],
+# "difficulty": users x chores matrix (optional), "hard_cap": [bools] (optional),
+# "loved" / "hated" / "forbidden" / "pinned": [[user_index, chore_index], ...] (optional)}
+def parse_columnar(columns: Dict) -> Tuple[List[Chore], List[User]]:
+    if not isinstance(columns, dict):
+        raise ValueError("'columnar' must be an object")
+
+    chore_names = columns.get("chores") or []
+    user_names = columns.get("users") or []
+    for key, names in (("chores", chore_names), ("users", user_names)):
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError(f"'{key}' must be a list of names")
+    if not chore_names:
+        raise ValueError("No chores provided")
+    if not user_names:
+        raise ValueError("No users provided")
+    chore_amount = len(chore_names)
+    user_amount = len(user_names)
+
+    amounts = column_array(columns, "amounts", (chore_amount,), int)
+    max_chores = column_array(columns, "max_chores", (user_amount,), int)
+    if np.any(amounts <= 0):
+        raise ValueError("'amounts' must all be positive")
+    if len(set(chore_names)) != chore_amount or len(set(user_names)) != user_amount:
+        raise ValueError("Chore and user names must be unique")
+
+    if columns.get("difficulty") is None:
+        difficulty = np.zeros((user_amount, chore_amount), dtype=int)
+    else:
+        difficulty = column_array(columns, "difficulty", (user_amount, chore_amount), int)
+    if columns.get("hard_cap") is None:
+        hard_cap = np.zeros(user_amount, dtype=bool)
+    else:
+        hard_cap = column_array(columns, "hard_cap", (user_amount,), bool)
+
+    #index pairs split into one chore list per user
+    pairs = {key: split_pairs(columns, key, user_amount, chore_amount) for key in ("loved", "hated", "forbidden", "pinned")}
+
+    #the arrays are still turned into User and Chore objects: the scheduler's per user code (constraint masks,
+    #score tables, accuracy_score, fingerprints, decomposed groups sent to worker processes) reads them,
+    #and building them is one O(users x chores) pass next to a solve that is many times that
+    #rows that are all zero mean no difficulty, found in one pass so User does not rescan them
+    has_difficulty = np.any(difficulty != 0, axis=1)
+    difficulty_rows = difficulty.tolist()
+    max_chores = max_chores.tolist()
+
+    chores = [Chore(name, amount) for name, amount in zip(chore_names, amounts.tolist())]
+    users = [
+        User(user_names[i], max_chores[i],
+             difficulty=difficulty_rows[i] if has_difficulty[i] else None,
+             hated_chores=pairs["hated"][i], loved_chores=pairs["loved"][i],
+             forbidden_chores=pairs["forbidden"][i], pinned_chores=pairs["pinned"][i],
+             hard_cap=bool(hard_cap[i]))
+        for i in range(user_amount)
+    ]
+    return chores, users
+
+def column_array(columns: Dict, key: str, shape: Tuple, dtype) -> np.ndarray:
+    try:
+        array = integer_array(columns.get(key)) if dtype is int else np.asarray(columns.get(key), dtype=dtype)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be an array of {dtype.__name__}")
+    if array.shape != shape:
+        raise ValueError(f"'{key}' must have shape {list(shape)}, got {list(array.shape)}")
+    return array
+
+#whole numbers only, casting with dtype=int would silently truncate 1.7 to 1 and accept "1" or true
+def integer_array(value) -> np.ndarray:
+    array = np.asarray(value)
+    if array.dtype.kind == "f" and np.all(np.isfinite(array)) and np.all(array == np.floor(array)):
+        return array.astype(int)
+    if array.dtype.kind not in "iu":
+        raise ValueError("not an array of whole numbers")
+    return array.astype(int)
+
+def split_pairs(columns: Dict, key: str, user_amount: int, chore_amount: int) -> List[List[int]]:
+    if not columns.get(key):
+        return [[] for _ in range(user_amount)]
+
+    try:
+        pairs = integer_array(columns[key])
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be a list of [user_index, chore_index] pairs")
+    if pairs.ndim != 2 or pairs.shape[1] != 2:
+        raise ValueError(f"'{key}' must be a list of [user_index, chore_index] pairs")
+    if np.any(pairs < 0) or np.any(pairs[:, 0] >= user_amount) or np.any(pairs[:, 1] >= chore_amount):
+        raise ValueError(f"'{key}' has an index out of range")
+
+    pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
+    bounds = np.searchsorted(pairs[:, 0], np.arange(user_amount + 1))
+    chore_ids = pairs[:, 1].tolist()
+    return [chore_ids[bounds[i]:bounds[i + 1]] for i in range(user_amount)]
+
+#encodes a schedule by chore counts instead of repeated names, so the size no longer grows with chore volume
+def compact_schedule(scheduler, schedule, quality, response_format):
+    counts = scheduler.schedule_to_counts(schedule)
+    user_names = list(schedule.keys())
+    chore_names = [chore.name for chore in scheduler.chores]
+
+    if response_format == "counts":
+        compact = {}
+        for name in user_names:
+            row = counts[scheduler.user_index[name]]
+            compact[name] = {chore_names[j]: int(row[j]) for j in row.nonzero()[0]}
+        return compact, quality
+
+    rows = [counts[scheduler.user_index[name]] for name in user_names]
+    compact = {
+        "users": user_names,
+        "chores": chore_names,
+        "assignments": [[[int(j), int(row[j])] for j in row.nonzero()[0]] for row in rows]
+    }
+    #user_loads as arrays in the same user order, ratio and percentage are assigned / capacity
+    loads = quality['user_loads']
+    quality = dict(quality, user_loads={
+        "assigned": [loads[name]['assigned'] for name in user_names],
+        "capacity": [loads[name]['capacity'] for name in user_names]
+    })
+    return compact, quality
@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import threading
+from typing import Dict, List
+from Group_Chore_Scheduler import Chore, User, Chore_Scheduler
+
+#multi-period rotas
+#each period is scheduled with fairness measured over everything done so far,
+#so someone who carried more last week gets less this week
+#running totals per user are kept in SQLite, a new period reads them instead of replaying the whole history
+
+class Rotation_Store:
+    def __init__(self, path: str = "rotation.db"):
+        #one connection shared by the server's threads, guarded by a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        #planning a household reads, solves and then writes, so it holds that household's lock throughout
+        self.household_locks = {}
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS assignments (
+                    household TEXT NOT NULL,
+                    period INTEGER NOT NULL,
+                    user TEXT NOT NULL,
+                    assigned INTEGER NOT NULL,
+                    capacity INTEGER NOT NULL,
+                    chores TEXT NOT NULL,
+                    PRIMARY KEY (household, period, user)
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS totals (
+                    household TEXT NOT NULL,
+                    user TEXT NOT NULL,
+                    assigned INTEGER NOT NULL,
+                    capacity INTEGER NOT NULL,
+                    periods INTEGER NOT NULL,
+                    PRIMARY KEY (household, user)
+                )""")
+
+    def household_lock(self, household: str) -> threading.Lock:
+        with self.lock:
+            return self.household_locks.setdefault(household, threading.Lock())
+
+    #user name -> (chores done, capacity offered) over every stored period, or only those before the given period
+    #(the running totals minus the later periods, so it stays cheap however long the history is)
+    def history(self, household: str, before: int = None) -> Dict:
+        with self.lock:
+            rows = self.conn.execute("SELECT user, assigned, capacity FROM totals WHERE household = ?", (household,)).fetchall()
+            later = [] if before is None else self.conn.execute(
+                "SELECT user, SUM(assigned), SUM(capacity) FROM assignments WHERE household = ? AND period >= ? GROUP BY user",
+                (household, before)).fetchall()
+        history = {user: (assigned, capacity) for user, assigned, capacity in rows}
+        for user, assigned, capacity in later:
+            done, offered = history[user]
+            history[user] = (done - assigned, offered - capacity)
+        return history
+
+    #latest stored period, 0 when the household has none
+    def last_period(self, household: str) -> int:
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(period) FROM assignments WHERE household = ?", (household,)).fetchone()
+        return row[0] or 0
+
+    #stores one period's schedule and adds it to the running totals
+    def record(self, household: str, period: int, schedule: Dict[str, List[str]], capacity: Dict[str, int]):
+        with self.lock, self.conn:
+            self.insert_period(household, period, schedule, capacity)
+
+    #replaces period start and everything after it with the given schedules, in one transaction
+    def replace_from(self, household: str, start: int, schedules: List[Dict[str, List[str]]], capacity: Dict[str, int]):
+        with self.lock, self.conn:
+            self.remove_from(household, start)
+            for offset, schedule in enumerate(schedules):
+                self.insert_period(household, start + offset, schedule, capacity)
+
+    #callers hold self.lock inside a transaction
+    def insert_period(self, household: str, period: int, schedule: Dict[str, List[str]], capacity: Dict[str, int]):
+        for user, chores in schedule.items():
+            self.conn.execute(
+                "INSERT INTO assignments (household, period, user, assigned, capacity, chores) VALUES (?, ?, ?, ?, ?, ?)",
+                (household, period, user, len(chores), capacity[user], json.dumps(chores)))
+            self.conn.execute("""
+                INSERT INTO totals (household, user, assigned, capacity, periods) VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT (household, user) DO UPDATE SET
+                    assigned = assigned + excluded.assigned,
+                    capacity = capacity + excluded.capacity,
+                    periods = periods + 1""",
+                (household, user, len(chores), capacity[user]))
+
+    #forgets period and everything after it, taking them back out of the running totals
+    def drop_from(self, household: str, period: int):
+        with self.lock, self.conn:
+            self.remove_from(household, period)
+
+    #callers hold self.lock inside a transaction
+    def remove_from(self, household: str, period: int):
+        rows = self.conn.execute(
+            "SELECT user, SUM(assigned), SUM(capacity), COUNT(*) FROM assignments WHERE household = ? AND period >= ? GROUP BY user",
+            (household, period)).fetchall()
+        for user, assigned, capacity, periods in rows:
+            self.conn.execute(
+                "UPDATE totals SET assigned = assigned - ?, capacity = capacity - ?, periods = periods - ? WHERE household = ? AND user = ?",
+                (assigned, capacity, periods, household, user))
+        self.conn.execute("DELETE FROM totals WHERE household = ? AND periods <= 0", (household,))
+        self.conn.execute("DELETE FROM assignments WHERE household = ? AND period >= ?", (household, period))
+
+    #period -> schedule for every stored period
+    def schedules(self, household: str) -> Dict[int, Dict[str, List[str]]]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT period, user, chores FROM assignments WHERE household = ? ORDER BY period", (household,)).fetchall()
+        schedules = {}
+        for period, user, chores in rows:
+            schedules.setdefault(period, {})[user] = json.loads(chores)
+        return schedules
+
+    def close(self):
+        self.conn.close()
+
+class Rotation_Scheduler:
+    def __init__(self, store: Rotation_Store, household: str):
+        self.store = store
+        self.household = household
+
+    #rolling horizon: periods before start_period stay as they are, start_period and later are re-planned
+    #(start_period None means the period after the last stored one)
+    #every period is solved before anything is stored, then the old periods are swapped for the new ones
+    #in one transaction, so a plan that fails leaves the stored history untouched
+    #the scheduler is built once and only its history changes between periods
+    def plan(self, chores: List[Chore], users: List[User], start_period: int = None, periods: int = 1,
+             seed: int = None, weights: Dict = None, **solve_options) -> List[Dict]:
+        with self.store.household_lock(self.household):
+            if start_period is None:
+                start_period = self.store.last_period(self.household) + 1
+            history = self.store.history(self.household, before=start_period)
+
+            scheduler = Chore_Scheduler(chores, users, seed=seed, history=dict(history), weights=weights)
+            capacity = {user.name: user.max_chores for user in scheduler.users}
+
+            plans = []
+            for period in range(start_period, start_period + periods):
+                if period > start_period:
+                    scheduler.set_history(dict(history))
+                best_schedule, best_score = scheduler.solve(**solve_options)
+                #later periods count this one without it being stored yet
+                for user, assigned in best_schedule.items():
+                    done, offered = history.get(user, (0, 0))
+                    history[user] = (done + len(assigned), offered + capacity[user])
+                plans.append({
+                    'period': period,
+                    'schedule': best_schedule,
+                    'score': float(best_score),
+                    'quality': scheduler.accuracy_score(best_schedule)
+                })
+
+            self.store.replace_from(self.household, start_period, [plan['schedule'] for plan in plans], capacity)
+        return plans
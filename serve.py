@@ -0,0 +1,8 @@
+#development server entry point: python serve.py
+#the solver's pool workers re-run the launching script as __mp_main__ before they take work,
+#everything here sits under the main guard so they never import Flask or the app
+if __name__ == "__main__":
+    from api import app, prewarm
+
+    prewarm()
+    app.run(debug=True)
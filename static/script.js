@@ -312,8 +312,43 @@ function renderPreferences() {
   });
 }
 
+// Expand "counts" / "indexed" responses into {user: {chore: count}} and per-user loads
+function normalizeSchedule(schedule, quality) {
+  if (schedule && Array.isArray(schedule.assignments)) {
+    const counts = {};
+    const loads = {};
+    schedule.users.forEach((user, i) => {
+      counts[user] = {};
+      schedule.assignments[i].forEach(([choreIdx, count]) => {
+        counts[user][schedule.chores[choreIdx]] = count;
+      });
+
+      if (quality && quality.user_loads && Array.isArray(quality.user_loads.assigned)) {
+        const assigned = quality.user_loads.assigned[i];
+        const capacity = quality.user_loads.capacity[i];
+        const ratio = capacity ? assigned / capacity : 0;
+        loads[user] = {
+          assigned,
+          capacity,
+          ratio: Math.round(ratio * 100) / 100,
+          percentage: Math.round(ratio * 1000) / 10,
+        };
+      }
+    });
+
+    if (quality && Array.isArray(quality.user_loads?.assigned)) {
+      quality = { ...quality, user_loads: loads };
+    }
+    return { schedule: counts, quality };
+  }
+
+  return { schedule, quality };
+}
+
 // Render schedule table
 function renderSchedule(schedule, quality) {
+  ({ schedule, quality } = normalizeSchedule(schedule, quality));
+
   //added quality summary
   qualityOutput.innerHTML = "";
 
@@ -382,7 +417,14 @@ function renderSchedule(schedule, quality) {
     userCell.textContent = user;
 
     const choresCell = document.createElement("td");
-    choresCell.textContent = (choresArr || []).join(", ");
+    if (Array.isArray(choresArr)) {
+      choresCell.textContent = choresArr.join(", ");
+    } else {
+      //compact response, {chore: count}
+      choresCell.textContent = Object.entries(choresArr || {})
+        .map(([chore, count]) => (count > 1 ? `${chore} x${count}` : chore))
+        .join(", ");
+    }
 
     row.appendChild(userCell);
     row.appendChild(choresCell);
@@ -510,7 +552,7 @@ generateBtn.addEventListener("click", async () => {
     const res = await fetch(API_URL, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ users, chores, difficulties, loved, hated, annealing,}),
+      body: JSON.stringify({ users, chores, difficulties, loved, hated, annealing, format: "counts",}),
     });
 
     if (!res.ok) {
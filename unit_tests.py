@@ -496,6 +496,147 @@ def test_weak_mixed_preference_types():
     print("Now that we have gotten less conflicting difficulties, user_2 should get none of chore_3 and user_0 should get all chore_2")
 
 
+# =============================================================================
+# CONSTRAINT TESTS
+# =============================================================================
+
+def test_hard_constraints():
+    chores = [Chore("dishes", 2), Chore("cooking", 2), Chore("trash", 2)]
+    users = [
+        User("User_1", max_chores=2, forbidden_chores=[0], hard_cap=True),  # Never does dishes, at most 2 chores
+        User("User_2", max_chores=3, pinned_chores=[2]),                    # Only one who takes out the trash
+        User("User_3", max_chores=3)
+    ]
+    cs = Chore_Scheduler(chores, users)
+    schedule, score = cs.simulated_annealing()
+    quality = cs.accuracy_score(schedule)
+    print_test_results("42. Hard Constraints", cs, schedule, score, quality)
+    print(f"Constraints held: {'dishes' not in schedule['User_1'] and len(schedule['User_1']) <= 2 and schedule['User_2'].count('trash') == 2}")
+    print("EXPECTED: User_1 never gets dishes and has at most 2 chores, all trash goes to User_2")
+    print()
+
+def test_exact_solver():
+    chores = [Chore("chore_0", 2), Chore("chore_1", 2), Chore("chore_2", 2), Chore("chore_3", 2)]
+    users = [
+        User("user_0", max_chores=3, difficulty=[5, -5, -3, -1], loved_chores=[2]),
+        User("user_1", max_chores=3, difficulty=[-5, 0, 5, -2], loved_chores=[1]),
+        User("user_2", max_chores=3, difficulty=[6, -4, 0, 8], hated_chores=[3]),
+        User("user_3", max_chores=3, difficulty=[1, 1, 1, 1]),
+    ]
+    cs = Chore_Scheduler(chores, users)
+    schedule, score = cs.solve(engine="exact")
+    _, annealed_score = cs.solve(engine="annealing")
+    quality = cs.accuracy_score(schedule)
+    print_test_results("43. Exact Solver", cs, schedule, score, quality)
+    print(f"Exact score: {score:.2f}, Annealing score: {annealed_score:.2f}")
+    print("EXPECTED: Exact score is never lower than the annealing score")
+    print()
+
+
+def test_optimality_gap():
+    chores = [Chore("dishes", 1), Chore("cooking", 1), Chore("trash", 1), 
+              Chore("laundry", 1), Chore("vacuum", 1), Chore("mop", 1)]
+    users = [
+        User("User_1", max_chores=3, difficulty=[5, 5, 5, -5, -5, -5]),
+        User("User_2", max_chores=3, difficulty=[-5, -5, -5, 5, 5, 5])
+    ]
+    cs = Chore_Scheduler(chores, users)
+    schedule, score = cs.simulated_annealing(max_iterations=1500, gap_tolerance=0.0)
+    quality = cs.accuracy_score(schedule)
+    report = cs.optimality_report(score)
+    print_test_results("44. Optimality Gap Early Stop", cs, schedule, score, quality)
+    print(f"Objective: {report['objective']}, Upper Bound: {report['upper_bound']}, Gap: {report['gap']}, Iterations: {report['iterations']}/1500")
+    print("EXPECTED: Gap of 0 reached well before 1500 iterations")
+    print()
+
+def test_decomposed_community():
+    chores = [Chore(f"chore_{j}", 80) for j in range(8)]
+    users = [
+        User(f"user_{i}", max_chores=2 + i % 4,
+             difficulty=[(i + j) % 7 - 3 for j in range(8)],
+             loved_chores=[i % 8])
+        for i in range(200)
+    ]
+    cs = Chore_Scheduler(chores, users, seed=42)
+    schedule, score = cs.solve(max_iterations=200)
+    quality = cs.accuracy_score(schedule)
+    print(f"TEST: 45. Decomposed Community ({cs.engine_used})")
+    print(f"  Quality Score: {quality['score']}/100 ({quality['score_results']})")
+    print(f"  Situation: {quality['situation']}")
+    print(f"  Chores Assigned: {sum(len(c) for c in schedule.values())}/{cs.total_chores}")
+    print("EXPECTED: 'decomposed' engine and every chore assigned")
+    print()
+
+
+def test_checkpoint_resume():
+    import os, tempfile
+    chores = [Chore("dishes", 4), Chore("cooking", 4), Chore("trash", 4), Chore("laundry", 4)]
+    users = [
+        User("User_1", max_chores=6, difficulty=[3, -2, 1, 0], loved_chores=[0]),
+        User("User_2", max_chores=5, difficulty=[-1, 4, 0, 2], hated_chores=[2]),
+        User("User_3", max_chores=5, difficulty=[0, 1, 3, -3])
+    ]
+    path = os.path.join(tempfile.mkdtemp(), "anneal.ckpt")
+
+    full_schedule, full_score = Chore_Scheduler(chores, users, seed=7).simulated_annealing(max_iterations=600)
+    #stop halfway, then resume from the checkpoint with a fresh scheduler
+    Chore_Scheduler(chores, users, seed=7).simulated_annealing(max_iterations=300, checkpoint_path=path)
+    cs = Chore_Scheduler(chores, users, seed=7)
+    schedule, score = cs.simulated_annealing(max_iterations=600, checkpoint_path=path)
+    quality = cs.accuracy_score(schedule)
+    print_test_results("46. Checkpoint Resume", cs, schedule, score, quality)
+    print(f"Resumed run matches uninterrupted run: {schedule == full_schedule and score == full_score}")
+    print("EXPECTED: True")
+    print()
+
+def test_rotation_cumulative_fairness():
+    import os, tempfile
+    from rotation import Rotation_Store, Rotation_Scheduler
+    chores = [Chore("dishes", 2), Chore("trash", 1)]
+    users = [User("User_1", max_chores=3), User("User_2", max_chores=3)]
+    store = Rotation_Store(os.path.join(tempfile.mkdtemp(), "rotation.db"))
+    plans = Rotation_Scheduler(store, "house").plan(chores, users, start_period=1, periods=4, seed=1)
+    print("TEST: 47. Rotation Cumulative Fairness")
+    for plan in plans:
+        print(f"  Week {plan['period']}: {plan['schedule']}")
+    print(f"  Totals: {store.history('house')}")
+    print("EXPECTED: The extra chore alternates between users, totals end up equal")
+    print()
+    store.close()
+
+
+def test_weight_sweep():
+    chores = [Chore("dishes", 3), Chore("trash", 3)]
+    users = [
+        User("User_1", max_chores=6, difficulty=None, hated_chores=[], loved_chores=[0, 1]),
+        User("User_2", max_chores=6, difficulty=None, hated_chores=[], loved_chores=[])
+    ]
+    scheduler = Chore_Scheduler(chores, users, seed=1)
+    results = scheduler.weight_sweep(max_iterations=300)
+    print("TEST: 48. Fairness / Preference Weight Sweep")
+    for result in results:
+        print(f"  fairness={result['weights']['fairness']} love={result['weights']['love']}: "
+              f"{result['components']} pareto={result['pareto']}")
+    print("EXPECTED: Fairness-first settings split the chores evenly, preference-first ones give User_1 more of what they love")
+    print()
+
+def test_component_cache():
+    chores = [Chore("dishes", 4), Chore("trash", 3), Chore("laundry", 3)]
+    users = [
+        User("User_1", max_chores=4, difficulty=[2, -3, 1], hated_chores=[1], loved_chores=[0]),
+        User("User_2", max_chores=3, difficulty=None, hated_chores=[0], loved_chores=[2]),
+        User("User_3", max_chores=3, difficulty=[-1, 0, 4], hated_chores=[], loved_chores=[1])
+    ]
+    scheduler = Chore_Scheduler(chores, users, seed=1)
+    best_schedule, best_score = scheduler.simulated_annealing(max_iterations=300)
+    reordered = {name: list(reversed(assigned)) for name, assigned in best_schedule.items()}
+    print("TEST: 49. Per User Score Cache")
+    print(f"  Score: {best_score}, reordered schedule scores: {scheduler.evaluation_function(reordered)}")
+    print(f"  Cache: {scheduler.cache_stats()}")
+    print("EXPECTED: Both scores match, most lookups are hits")
+    print()
+
+
 # =============================================================================
 # RUN ALL TESTS
 # =============================================================================
@@ -540,4 +681,12 @@ if __name__ == "__main__":
     # test_mixed_preference_types() 
     # test_weak_mixed_preference_types()
 
-   
\ No newline at end of file
+   
+    # test_hard_constraints()
+    # test_exact_solver()
+    # test_optimality_gap()
+    # test_decomposed_community()
+    # test_checkpoint_resume()
+    # test_rotation_cumulative_fairness()
+    # test_weight_sweep()
+    # test_component_cache()